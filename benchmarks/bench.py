@@ -0,0 +1,240 @@
+"""Benchmarks for the statistics and display hot paths.
+
+Runs `RunningStat.push`, `collect_stats`, `HistogramVisual._calc_hist` and
+`ImageView.autoscale` (with `np.percentile` on the same subsample as a reference
+for its speedup) on synthetic Poisson frames (no camera needed) over a
+matrix of frame sizes, dtypes and frame counts, and reports frames/s, MB/s and
+peak (traced) memory.  Everything runs headless.
+
+    python benchmarks/bench.py --quick
+    python benchmarks/bench.py -o results.json
+    python benchmarks/bench.py --baseline results.json --tolerance 0.2
+
+With `--baseline`, results are compared against a previous JSON output, and the
+exit code is 1 if any benchmark got slower than the tolerance allows.  Timings
+depend on the machine, so no baseline is committed: make one on the machine you
+compare on, from the revision to compare against, e.g.
+
+    git stash && python benchmarks/bench.py --repeat 5 -o baseline.json
+    git stash pop && python benchmarks/bench.py --repeat 5 --baseline baseline.json
+
+The best (fastest) of the `--repeat` runs is compared, and the tolerance is
+widened to the run-to-run spread of either side, so noisy benchmarks don't
+report false regressions.  Without `--tolerance`, it is 0.1 for 3 or more
+repeats, and 0.25 below that (e.g. `--quick`), where the spread is unknown.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from itertools import cycle
+from typing import Callable, Iterator
+
+import numpy as np
+
+from pyptc._ptc import RunningStat, collect_stats
+
+# photon counts that use a good part of each dtype's range
+# (float64 is the dtype of the mean and variance maps that the GUI displays)
+LAMBDA = {"uint8": 20, "uint16": 1000, "float32": 1000, "float64": 1000}
+POOL = 4  # distinct frames per case; generating Poisson frames is slow
+
+
+def poisson_frames(size: int, dtype: str, pool: int = POOL) -> list[np.ndarray]:
+    """Return `pool` random Poisson frames, like the generator in debug.py."""
+    rng = np.random.default_rng(0)
+    return [
+        rng.poisson(LAMBDA[dtype], size=(size, size)).astype(dtype) for _ in range(pool)
+    ]
+
+
+def bench_push(frames: list[np.ndarray], n: int) -> None:
+    stat = RunningStat()
+    for _, img in zip(range(n), cycle(frames)):
+        stat.push(img)
+
+
+def bench_collect_stats(frames: list[np.ndarray], n: int) -> None:
+    collect_stats(cycle(frames).__next__, n)
+
+
+def _display_benchmarks() -> dict[str, Callable[[list[np.ndarray], int], None]]:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from pyptc._histogram import HistogramVisual
+        from pyptc._image import ImageView
+    except ImportError as e:
+        print(f"skipping display benchmarks: {e}", file=sys.stderr)
+        return {}
+
+    def bench_calc_hist(frames: list[np.ndarray], n: int) -> None:
+        visual = HistogramVisual(np.zeros(1), bins=256)
+        for _, img in zip(range(n), cycle(frames)):
+            visual._calc_hist(img.ravel(), 256)
+
+    def bench_autoscale(frames: list[np.ndarray], n: int) -> None:
+        view = ImageView()
+        for _, img in zip(range(n), cycle(frames)):
+            view.image._data = img  # skip the texture upload, time only autoscale
+            view.autoscale(smooth=True)
+
+    def bench_percentile(frames: list[np.ndarray], n: int) -> None:
+        # what autoscale would cost if it sorted: the reference for its speedup
+        view = ImageView()
+        step = (slice(None, None, view.clim_stride),) * 2
+        for _, img in zip(range(n), cycle(frames)):
+            np.percentile(img[step], view.clim_percentiles)
+
+    return {
+        "calc_hist": bench_calc_hist,
+        "autoscale": bench_autoscale,
+        "percentile": bench_percentile,
+    }
+
+
+def run_case(
+    func: Callable[[list[np.ndarray], int], None],
+    frames: list[np.ndarray],
+    n: int,
+    repeat: int,
+) -> dict[str, float]:
+    """Time `func(frames, n)` (best of `repeat`), then measure its peak memory."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(frames, n)
+        times.append(time.perf_counter() - t0)
+    best = min(times)
+    # traced separately: tracemalloc slows allocation down
+    tracemalloc.start()
+    func(frames, n)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    nbytes = frames[0].nbytes * n
+    return {
+        "seconds": best,
+        "spread": max(times) / best - 1,  # run-to-run noise, relative to the best
+        "fps": n / best,
+        "MB/s": nbytes / 1e6 / best,
+        "peak_MB": peak / 1e6,
+    }
+
+
+def iter_results(
+    benchmarks: dict[str, Callable],
+    sizes: list[int],
+    dtypes: list[str],
+    counts: list[int],
+    repeat: int,
+) -> Iterator[dict]:
+    for size in sizes:
+        for dtype in dtypes:
+            frames = poisson_frames(size, dtype)
+            for n in counts:
+                for name, func in benchmarks.items():
+                    result = run_case(func, frames, n, repeat)
+                    yield {
+                        "id": f"{name}[{size}-{dtype}-{n}]",
+                        "name": name,
+                        "size": size,
+                        "dtype": dtype,
+                        "frames": n,
+                        **result,
+                    }
+
+
+def compare(
+    results: list[dict], baseline: list[dict], tolerance: float
+) -> list[tuple[dict, float]]:
+    """Return (result, speedup) for each result that regressed beyond tolerance.
+
+    `speedup` is the ratio of current to baseline (best-of-N) frames/s.  The
+    tolerance for each result is at least the larger run-to-run spread of the
+    result and its baseline.  Results without a matching baseline are ignored.
+    """
+    base = {r["id"]: r for r in baseline}
+    regressions = []
+    for r in results:
+        if r["id"] in base:
+            b = base[r["id"]]
+            speedup = r["fps"] / b["fps"]
+            r["speedup"] = speedup
+            noise = max(r.get("spread", 0), b.get("spread", 0))
+            if speedup < 1 - max(tolerance, noise):
+                regressions.append((r, speedup))
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[512, 1024, 2048, 4096])
+    parser.add_argument(
+        "--dtypes", nargs="+", default=list(LAMBDA), choices=list(LAMBDA)
+    )
+    parser.add_argument("--frames", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs")
+    parser.add_argument(
+        "--only", nargs="+", help="run only these benchmarks (e.g. push calc_hist)"
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="a small matrix, for a smoke test"
+    )
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON results file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        help="allowed fractional slowdown vs. the baseline (default 0.1, or 0.25 "
+        "with fewer than 3 repeats)",
+    )
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.sizes, args.frames, args.repeat = [512], [10], 1
+    if args.tolerance is None:
+        args.tolerance = 0.1 if args.repeat >= 3 else 0.25
+
+    benchmarks: dict[str, Callable] = {
+        "push": bench_push,
+        "collect_stats": bench_collect_stats,
+        **_display_benchmarks(),
+    }
+    if args.only:
+        benchmarks = {k: v for k, v in benchmarks.items() if k in args.only}
+
+    results = []
+    print(f"{'benchmark':<36}{'frames/s':>12}{'MB/s':>12}{'peak MB':>12}")
+    for r in iter_results(
+        benchmarks, args.sizes, args.dtypes, args.frames, args.repeat
+    ):
+        results.append(r)
+        print(f"{r['id']:<36}{r['fps']:>12.1f}{r['MB/s']:>12.1f}{r['peak_MB']:>12.1f}")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for r, speedup in regressions:
+            print(f"REGRESSION {r['id']}: {speedup:.2f}x baseline", file=sys.stderr)
+
+    if args.output:
+        meta = {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        with open(args.output, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
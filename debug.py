@@ -19,20 +19,20 @@ app.setStyleSheet(qdarkstyle.load_stylesheet())
 # hist = ctrls.histogram
 
 
-from pyptc._ptc import collect_stats, RunningStat
+from pyptc._ptc import collect_stats
 from pyptc._image import Image
 window = Image()
 window.show()
 window[0, 0].set_data(core.snap())
 window[1, 0].set_data(core.snap())
 
-def update(img, stats: RunningStat):
-    window[0, 0].set_data(stats.mean())
-    window[1, 0].set_data(stats.var())
-    app.processEvents()
-
 def snap():
     return np.random.poisson(size=(512,512))
-stats = collect_stats(snap, n=1000, callback=update)
 
-# app.exec_()
\ No newline at end of file
+# acquisition runs at full speed on a thread, the display redraws at window.scheduler.max_fps
+import threading
+threading.Thread(
+    target=collect_stats, args=(snap, 1000, window.stats_callback()), daemon=True
+).start()
+
+app.exec_()
\ No newline at end of file
@@ -1,6 +1,8 @@
 """photon transfer curve acuisition"""
 
+from importlib import import_module
 from importlib.metadata import PackageNotFoundError, version
+from typing import TYPE_CHECKING, Any
 
 try:
     __version__ = version("pyptc")
@@ -8,3 +10,95 @@ except PackageNotFoundError:
     __version__ = "uninstalled"
 __author__ = "Talley Lambert"
 __email__ = "talley.lambert@gmail.com"
+
+# Public names are imported from their module on first access, so that
+# `import pyptc` stays cheap, and the statistics core can be used headless
+# (without Qt, vispy or pymmcore_plus ever being imported).
+_LAZY = {
+    "Accumulator": "_ptc",
+    "ClippedStat": "_ptc",
+    "FrameTimings": "_ptc",
+    "HistogramStat": "_ptc",
+    "MomentStat": "_ptc",
+    "PairDiffStat": "_ptc",
+    "PTCFit": "_ptc",
+    "PTCResult": "_ptc",
+    "QuantileStat": "_ptc",
+    "RegionStat": "_ptc",
+    "RunningStat": "_ptc",
+    "acquire_ptc": "_ptc",
+    "collect_stats": "_ptc",
+    "collect_stats_parallel": "_ptc",
+    "FrameRing": "_sequence",
+    "collect_sequence_stats": "_sequence",
+    "FrameWriter": "_writer",
+    "read_frames": "_writer",
+    "DefectDetector": "_defects",
+    "StatSnapshot": "_aio",
+    "acollect_stats": "_aio",
+    "stream_stats": "_aio",
+    "CameraRun": "_multi",
+    "CameraSource": "_multi",
+    "collect_cameras": "_multi",
+    "collect_multicamera_stats": "_multi",
+    "AcquisitionWorker": "_shm",
+    "SharedRing": "_shm",
+    "AdapterCatalog": "_core_utils",
+    "load_all_cameras": "_core_utils",
+    "probe_adapters": "_core_utils",
+    # GUI (requires Qt and vispy)
+    "Histogram": "_histogram",
+    "Image": "_image",
+    "MainWindow": "_main_window",
+}
+
+__all__ = ["__version__", *_LAZY]
+
+if TYPE_CHECKING:
+    from ._aio import StatSnapshot, acollect_stats, stream_stats  # noqa: F401
+    from ._core_utils import (  # noqa: F401
+        AdapterCatalog,
+        load_all_cameras,
+        probe_adapters,
+    )
+    from ._defects import DefectDetector  # noqa: F401
+    from ._histogram import Histogram  # noqa: F401
+    from ._image import Image  # noqa: F401
+    from ._main_window import MainWindow  # noqa: F401
+    from ._multi import (  # noqa: F401
+        CameraRun,
+        CameraSource,
+        collect_cameras,
+        collect_multicamera_stats,
+    )
+    from ._ptc import (  # noqa: F401
+        Accumulator,
+        ClippedStat,
+        FrameTimings,
+        HistogramStat,
+        MomentStat,
+        PairDiffStat,
+        PTCFit,
+        PTCResult,
+        QuantileStat,
+        RegionStat,
+        RunningStat,
+        acquire_ptc,
+        collect_stats,
+        collect_stats_parallel,
+    )
+    from ._sequence import FrameRing, collect_sequence_stats  # noqa: F401
+    from ._shm import AcquisitionWorker, SharedRing  # noqa: F401
+    from ._writer import FrameWriter, read_frames  # noqa: F401
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        value = getattr(import_module(f".{_LAZY[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
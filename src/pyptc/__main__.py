@@ -17,4 +17,6 @@ def main():
 
     app.exec_()
 
-main()
\ No newline at end of file
+
+if __name__ == "__main__":
+    main()
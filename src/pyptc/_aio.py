@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, AsyncIterator, Callable
+
+import numpy as np
+
+from ._ptc import Accumulator, RunningStat, collect_stats
+
+
+@dataclass(frozen=True)
+class StatSnapshot:
+    """Read-only copy of the state of an accumulator during `stream_stats`.
+
+    Attributes
+    ----------
+    n : int
+        Number of frames pushed so far.
+    mean : float | np.ndarray
+        Copy of ``stat.mean()`` (arrays are not writeable).
+    var : float | np.ndarray
+        Copy of ``stat.var()`` (arrays are not writeable).
+    dropped : int
+        ``stat.dropped``
+    elapsed : float
+        Seconds since the collection started.
+    done : bool
+        Whether this is the final snapshot.
+    """
+
+    n: int
+    mean: float | np.ndarray
+    var: float | np.ndarray
+    dropped: int
+    elapsed: float
+    done: bool = False
+
+
+def _readonly(value: float | np.ndarray) -> float | np.ndarray:
+    if isinstance(value, np.ndarray):
+        value = value.copy()
+        value.flags.writeable = False
+    return value
+
+
+def _snapshot(stat: Accumulator, t0: float, done: bool = False) -> StatSnapshot:
+    return StatSnapshot(
+        n=len(stat),
+        mean=_readonly(stat.mean()),
+        var=_readonly(stat.var()),
+        dropped=stat.dropped,
+        elapsed=time.perf_counter() - t0,
+        done=done,
+    )
+
+
+def _cancellable(
+    snap: Callable[[], np.ndarray], cancel: threading.Event
+) -> Callable[[], np.ndarray]:
+    # stops `collect_stats` (in its thread) before the next frame, once cancelled
+    def _snap() -> np.ndarray:
+        if cancel.is_set():
+            raise asyncio.CancelledError
+        return snap()
+
+    return _snap
+
+
+async def acollect_stats(
+    snap: Callable[[], np.ndarray],
+    n: int = 100,
+    callback: Callable | None = None,
+    stat: Accumulator | None = None,
+    executor: Executor | None = None,
+    **kwargs: Any,
+) -> Accumulator:
+    """Async version of `collect_stats`.
+
+    Acquisition and accumulation run in `executor` (by default the event loop's
+    default executor), so the event loop stays responsive, and several cameras can
+    be driven concurrently, e.g. with `asyncio.gather`.  If the awaiting task is
+    cancelled, the collection stops before the next frame.
+
+    `callback` is called from the executor thread.  Other keyword arguments are
+    passed to `collect_stats`.
+    """
+    loop = asyncio.get_running_loop()
+    cancel = threading.Event()
+    func = partial(collect_stats, _cancellable(snap, cancel), n, callback, stat)
+    try:
+        return await loop.run_in_executor(executor, partial(func, **kwargs))
+    finally:
+        cancel.set()
+
+
+async def stream_stats(
+    snap: Callable[[], np.ndarray],
+    n: int = 100,
+    interval: float = 0.1,
+    callback: Callable | None = None,
+    stat: Accumulator | None = None,
+    executor: Executor | None = None,
+    **kwargs: Any,
+) -> AsyncIterator[StatSnapshot]:
+    """Collect statistics off-loop, yielding snapshots of them as they evolve.
+
+    Use as ``async for snapshot in stream_stats(core.snap, 100): ...``.  At most
+    one `StatSnapshot` is taken (in the executor thread) every `interval` seconds,
+    and a slow consumer only ever gets the latest one.  The last snapshot has
+    ``done=True``.  Leaving the loop early (or cancelling the consuming task)
+    stops the collection before the next frame.
+
+    Other arguments are as for `acollect_stats`.
+    """
+    loop = asyncio.get_running_loop()
+    stat = RunningStat() if stat is None else stat
+    cancel = threading.Event()
+    ready = asyncio.Event()
+    latest: list[StatSnapshot] = []
+    t0 = time.perf_counter()
+    last = -np.inf
+
+    def _deliver(snapshot: StatSnapshot) -> None:
+        latest[:] = [snapshot]
+        ready.set()
+
+    def _callback(img: np.ndarray, stat: Accumulator) -> None:
+        nonlocal last
+        if callback is not None:
+            callback(img, stat)
+        now = time.perf_counter()
+        if now - last >= interval:
+            last = now
+            loop.call_soon_threadsafe(_deliver, _snapshot(stat, t0))
+
+    func = partial(collect_stats, _cancellable(snap, cancel), n, _callback, stat)
+    future = loop.run_in_executor(executor, partial(func, **kwargs))
+    waiter: asyncio.Future | None = None
+    try:
+        while True:
+            waiter = asyncio.ensure_future(ready.wait())
+            await asyncio.wait({waiter, future}, return_when=asyncio.FIRST_COMPLETED)
+            if latest and not future.done():
+                ready.clear()
+                yield latest.pop()
+            if future.done():
+                yield _snapshot(future.result(), t0, done=True)
+                return
+    finally:
+        cancel.set()
+        if waiter is not None:
+            waiter.cancel()
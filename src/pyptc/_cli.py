@@ -0,0 +1,275 @@
+"""Headless, batch photon transfer curve acquisition.
+
+    pyptc-batch MMConfig.cfg --camera Camera --sweep 1 1000 20 --frames 100 -o out/
+
+For each camera, exposures are swept with `acquire_ptc`, starting with a dark
+(0 ms) point that the fit takes the offset and read noise from, and the curve and
+its fit are written to ``<output>/<camera>/ptc.npz`` and ``ptc.json``.  Progress
+and throughput are printed to stdout as each exposure completes.  A camera that
+fails is reported on stderr and recorded in ``<output>/failures.json``, and the
+remaining cameras are still run; the exit status is 1 if any camera failed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Sequence, TextIO
+
+import numpy as np
+
+from ._ptc import (
+    Accumulator,
+    PairDiffStat,
+    PTCResult,
+    RegionStat,
+    RunningStat,
+    acquire_ptc,
+)
+
+if TYPE_CHECKING:
+    from pymmcore_plus import CMMCorePlus
+
+STATS: dict[str, Callable[..., Accumulator]] = {
+    "running": RunningStat,
+    "pairdiff": PairDiffStat,
+}
+
+
+class Progress:
+    """`collect_stats` callback that reports each exposure as it completes."""
+
+    def __init__(
+        self, n_frames: int, exposures: Sequence[float], file: TextIO = sys.stdout
+    ) -> None:
+        self.n_frames = n_frames
+        self.exposures = list(exposures)
+        self.file = file
+        self.point = 0
+        self._t0 = time.perf_counter()
+        self._t_point = self._t0
+
+    def __call__(self, img: np.ndarray, stat: Accumulator) -> None:
+        if len(stat) < self.n_frames:
+            return
+        now = time.perf_counter()
+        elapsed = now - self._t_point
+        fps = self.n_frames / elapsed if elapsed else float("inf")
+        print(
+            f"[{self.point + 1}/{len(self.exposures)}] "
+            f"exposure {self.exposures[self.point]:g} ms: "
+            f"{self.n_frames} frames in {elapsed:.2f} s "
+            f"({fps:.1f} fps, {fps * img.nbytes / 1e6:.1f} MB/s), "
+            f"mean {np.mean(stat.mean()):.1f}, var {np.mean(stat.var()):.1f}",
+            file=self.file,
+            flush=True,
+        )
+        self.point += 1
+        self._t_point = now
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._t0
+
+
+def _make_core(config: str | None) -> CMMCorePlus:
+    from pymmcore_plus import CMMCorePlus
+
+    core = CMMCorePlus()
+    if config is None:
+        core.loadSystemConfiguration()  # the demo configuration
+    else:
+        core.loadSystemConfiguration(config)
+    return core
+
+
+def select_camera(core: CMMCorePlus, name: str | None, isolate: bool = False) -> str:
+    """Make the camera matching `name` current, and return its label.
+
+    `name` may be the label of a loaded camera, or the device or adapter name of
+    any camera that `load_all_cameras` can find.  If None, the current camera is
+    used.
+    """
+    from pymmcore_plus import DeviceType
+
+    from ._core_utils import load_all_cameras
+
+    if name is None:
+        label = core.getCameraDevice()
+        if not label:
+            raise RuntimeError("No camera is loaded; pass --camera")
+        return label
+    if name not in core.getLoadedDevicesOfType(DeviceType.CameraDevice):
+        for dev in load_all_cameras(core, isolate=isolate):
+            if name in (dev.label, dev.name(), dev.library()):
+                name = dev.label
+                break
+        else:
+            raise RuntimeError(f"Could not find or load a camera named {name!r}")
+    core.setCameraDevice(name)
+    return name
+
+
+def _jsonable(value: Any) -> Any:
+    value = np.asarray(value)
+    return value.item() if value.ndim == 0 else value.tolist()
+
+
+def save_result(
+    result: PTCResult, folder: str | Path, meta: dict[str, Any] | None = None
+) -> tuple[Path, Path]:
+    """Write `result` and its fit to ``ptc.npz`` and ``ptc.json`` in `folder`."""
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    fit = result.fit()
+    fit_dict = {k: _jsonable(v) for k, v in vars(fit).items()}
+    npz = folder / "ptc.npz"
+    np.savez(npz, **vars(result), **vars(fit))
+    info = {
+        **(meta or {}),
+        "n_frames": result.n_frames,
+        "exposures": _jsonable(result.exposures),
+        "signal": _jsonable(result.signal),
+        "variance": _jsonable(result.variance),
+        "fit": fit_dict,
+    }
+    js = folder / "ptc.json"
+    js.write_text(json.dumps(info, indent=2))
+    return npz, js
+
+
+def run_batch(
+    core: CMMCorePlus,
+    exposures: Sequence[float],
+    n_frames: int = 100,
+    settle: float = 0,
+    stat_type: Callable[[], Accumulator] = RunningStat,
+    output: str | Path | None = None,
+    meta: dict[str, Any] | None = None,
+    file: TextIO = sys.stdout,
+) -> PTCResult:
+    """Acquire a PTC from the current camera of `core`, reporting progress.
+
+    If `output` is given, the result is saved there with `save_result`.
+    """
+    progress = Progress(n_frames, exposures, file)
+    result = acquire_ptc(core, exposures, n_frames, settle, progress, stat_type)
+    fit = result.fit()
+    print(
+        f"done in {progress.elapsed:.1f} s: "
+        + ", ".join(f"{k} {np.mean(v):.3g}" for k, v in vars(fit).items()),
+        file=file,
+        flush=True,
+    )
+    if output is not None:
+        meta = {**(meta or {}), "elapsed": progress.elapsed}
+        for path in save_result(result, output, meta):
+            print(f"wrote {path}", file=file, flush=True)
+    return result
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pyptc-batch",
+        description="Acquire photon transfer curves without the GUI.",
+    )
+    parser.add_argument(
+        "config", nargs="?", help="Micro-Manager config file (default: demo config)"
+    )
+    parser.add_argument(
+        "-c",
+        "--camera",
+        action="append",
+        help="camera label, device or adapter name; repeat to characterize several "
+        "cameras back to back (default: the config's current camera)",
+    )
+    exp = parser.add_mutually_exclusive_group()
+    exp.add_argument(
+        "-e",
+        "--exposures",
+        type=float,
+        nargs="+",
+        help="in ms; a dark (0 ms) point is added if missing",
+    )
+    exp.add_argument(
+        "--sweep",
+        type=float,
+        nargs=3,
+        metavar=("START", "STOP", "NUM"),
+        default=(1, 1000, 20),
+        help="NUM log-spaced exposures from START to STOP ms, after a dark (0 ms) "
+        "point (default: 1 1000 20)",
+    )
+    parser.add_argument(
+        "-n", "--frames", type=int, default=100, help="frames per exposure"
+    )
+    parser.add_argument(
+        "--settle", type=float, default=0, help="s to wait after each exposure change"
+    )
+    parser.add_argument("--stat", choices=list(STATS), default="running")
+    parser.add_argument(
+        "--tile", type=int, help="fit one curve per TILExTILE region of the sensor"
+    )
+    parser.add_argument(
+        "--isolate",
+        action="store_true",
+        help="probe adapters in separate processes when searching for cameras",
+    )
+    parser.add_argument("-o", "--output", default="ptc", help="output directory")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    if args.exposures is not None:
+        exposures = args.exposures
+    else:
+        start, stop, num = args.sweep
+        exposures = np.geomspace(start, stop, int(num)).tolist()
+    if 0 not in exposures:
+        # the fit takes its offset and read noise from a dark point
+        exposures = [0.0, *exposures]
+    if args.tile:
+        stat_type: Callable[[], Accumulator] = partial(
+            RegionStat, tile=(args.tile, args.tile)
+        )
+    else:
+        stat_type = STATS[args.stat]
+
+    core = _make_core(args.config)
+    failures: dict[str, str] = {}
+    for name in args.camera or [None]:
+        label = name or "<current>"
+        try:
+            label = select_camera(core, name, args.isolate)
+            print(f"characterizing camera {label!r}", flush=True)
+            meta = {
+                "config": args.config,
+                "camera": label,
+                "stat": "region" if args.tile else args.stat,
+                "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            out = Path(args.output) / label
+            run_batch(core, exposures, args.frames, args.settle, stat_type, out, meta)
+        except Exception as e:
+            # one broken camera must not cost the results of the others
+            print(f"error: camera {label!r}: {type(e).__name__}: {e}", file=sys.stderr)
+            failures[label] = f"{type(e).__name__}: {e}"
+    if failures:
+        print(
+            f"{len(failures)} of {len(args.camera or [None])} camera(s) failed: "
+            + ", ".join(map(repr, failures)),
+            file=sys.stderr,
+        )
+        path = Path(args.output) / "failures.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(failures, indent=2))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
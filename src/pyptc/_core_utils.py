@@ -1,13 +1,151 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Callable, Iterator
-
-from loguru import logger
-from pymmcore_plus import CMMCorePlus
-from pymmcore_plus.core import Device, DeviceType
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from functools import lru_cache
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Sequence
 
+# pymmcore_plus is imported where it is used, so that importing this module is cheap
 if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
     import numpy as np
+    from pymmcore_plus import CMMCorePlus, Device, DeviceType
+
+logger = logging.getLogger(__name__)
+
+
+def _global_core() -> CMMCorePlus:
+    from pymmcore_plus import CMMCorePlus
+
+    return CMMCorePlus.instance()
+
+
+@lru_cache(maxsize=None)
+def _core_class() -> type[CMMCorePlus]:
+    from pymmcore_plus import CMMCorePlus
+
+    class _Core(CMMCorePlus):
+        """A standalone core, independent of `CMMCorePlus.instance()`.
+
+        Used to probe adapters in worker processes.
+        """
+
+        def __init__(self, adapter_paths: Sequence[str] = ()) -> None:
+            super().__init__(adapter_paths=adapter_paths)
+
+    return _Core
+
+
+def __getattr__(name: str) -> Any:
+    if name == "_Core":
+        return _core_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _probe_adapter(core: CMMCorePlus, adapter_name: str, test_cameras: bool) -> dict:
+    """Return a catalog entry for `adapter_name`.
+
+    If `test_cameras`, each camera is also loaded and initialized (then unloaded),
+    and the outcome recorded in ``entry["cameras"]`` (None or an error message).
+    """
+    from pymmcore_plus import DeviceType
+
+    try:
+        devices = core.getAvailableDevices(adapter_name)
+        types = core.getAvailableDeviceTypes(adapter_name)
+    except RuntimeError as e:
+        return {"error": str(e)}
+    entry: dict[str, Any] = {"devices": [[d, int(t)] for d, t in zip(devices, types)]}
+    if test_cameras:
+        entry["cameras"] = {}
+        for dev, typ in zip(devices, types):
+            if typ != DeviceType.CameraDevice:
+                continue
+            try:
+                core.loadDevice("_probe", adapter_name, dev)
+                core.initializeDevice("_probe")
+                entry["cameras"][dev] = None
+            except RuntimeError as e:
+                entry["cameras"][dev] = str(e)
+            finally:
+                if "_probe" in core.getLoadedDevices():
+                    core.unloadDevice("_probe")
+    return entry
+
+
+def _probe_worker(
+    adapter_name: str,
+    adapter_paths: Sequence[str],
+    test_cameras: bool,
+    conn: Connection,
+) -> None:
+    core = _core_class()(adapter_paths=adapter_paths)
+    conn.send(_probe_adapter(core, adapter_name, test_cameras))
+    conn.close()
+
+
+def probe_adapters(
+    adapter_names: Iterable[str],
+    adapter_paths: Sequence[str],
+    timeout: float = 10,
+    max_workers: int | None = None,
+    test_cameras: bool = True,
+) -> Iterator[tuple[str, dict]]:
+    """Probe adapters in isolated worker processes, yielding results as they finish.
+
+    Each adapter is enumerated (and, if `test_cameras`, its cameras load-tested) in
+    its own process, at most `max_workers` at a time.  An adapter that crashes
+    its process, or takes longer than `timeout` seconds (its process is then
+    killed), yields an entry with an "error" instead of taking the caller down.
+
+    Yields
+    ------
+    tuple[str, dict]
+        The adapter name and its catalog entry (see `AdapterCatalog`).
+    """
+    ctx = multiprocessing.get_context("spawn")
+    pending = list(adapter_names)
+    max_workers = max_workers or os.cpu_count() or 1
+    running: dict[str, tuple[Any, Connection, float]] = {}
+    while pending or running:
+        while pending and len(running) < max_workers:
+            name = pending.pop(0)
+            recv, send = ctx.Pipe(duplex=False)
+            args = (name, list(adapter_paths), test_cameras, send)
+            proc = ctx.Process(target=_probe_worker, args=args, daemon=True)
+            proc.start()
+            send.close()
+            running[name] = (proc, recv, time.monotonic() + timeout)
+
+        next_deadline = min(deadline for *_, deadline in running.values())
+        ready = wait(
+            [conn for _, conn, _ in running.values()],
+            timeout=max(0, next_deadline - time.monotonic()),
+        )
+        for name, (proc, conn, deadline) in list(running.items()):
+            if conn in ready:
+                try:
+                    entry = conn.recv()
+                except EOFError:
+                    proc.join()
+                    entry = {"error": f"probe crashed (exit code {proc.exitcode})"}
+            elif time.monotonic() >= deadline:
+                proc.kill()
+                entry = {"error": f"probe timed out after {timeout} s"}
+            else:
+                continue
+            proc.join()
+            conn.close()
+            del running[name]
+            logger.debug(f"Probed adapter {name!r}: {entry}")
+            yield name, entry
 
 
 class AvailableDevice:
@@ -20,14 +158,18 @@ class AvailableDevice:
     ):
         self.adapter = adapter
         self.device = device
+        from pymmcore_plus import DeviceType
+
         self.dtype = DeviceType(dtype) if dtype is not None else None
-        self.core = core or CMMCorePlus.instance()
+        self.core = core or _global_core()
 
     def __repr__(self) -> str:
         return f"AvailableDevice({self.adapter!r}, {self.device!r})"
 
     def load(self, device_label: str = "") -> Device:
         """Load a device from the adapter as the specified label."""
+        from pymmcore_plus import Device
+
         if not device_label:
             taken = set(self.core.getLoadedDevices())
             device_label = self.adapter
@@ -42,16 +184,173 @@ class AvailableDevice:
         return dev
 
 
+# adapter library file names, as Micro-Manager looks them up on each platform
+if sys.platform == "win32":
+    _LIB_PREFIX, _LIB_SUFFIX = "mmgr_dal_", ".dll"
+elif sys.platform == "darwin":
+    _LIB_PREFIX, _LIB_SUFFIX = "libmmgr_dal_", ""
+else:
+    _LIB_PREFIX, _LIB_SUFFIX = "libmmgr_dal_", ".so.0"
+
+
+def _default_cache_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "pyptc" / "adapter_catalog.json"
+
+
+class AdapterCatalog:
+    """On-disk cache of the (device, type) entries provided by each adapter.
+
+    Enumerating an adapter's devices means opening its library, which is slow
+    for a full Micro-Manager install.  Entries are keyed by the adapter library's
+    path, mtime and size, and are only re-probed when the library changes.
+
+    Only successes are saved: adapters that fail to enumerate (usually because of
+    a missing vendor SDK, not a change to the adapter itself) are remembered with
+    their error for the lifetime of the catalog only, and adapters with cameras
+    that failed a load test are saved without the load test results, so they are
+    tested again by the next `refresh`.
+
+    Parameters
+    ----------
+    core : CMMCorePlus | None, optional
+        The core used to find and probe adapters, by default the global instance.
+    path : str | Path | None, optional
+        The cache file, by default ``$XDG_CACHE_HOME/pyptc/adapter_catalog.json``
+        (``~/.cache/...``).
+    """
+
+    def __init__(
+        self, core: CMMCorePlus | None = None, path: str | Path | None = None
+    ) -> None:
+        self._core = core or _global_core()
+        self.path = Path(path) if path is not None else _default_cache_path()
+        self._entries: dict[str, dict] = {}
+        self._saved = ""  # the file contents, to skip writing unchanged entries
+        if self.path.exists():
+            try:
+                self._saved = self.path.read_text()
+                self._entries = json.loads(self._saved)
+            except (OSError, ValueError):
+                logger.debug(f"Ignoring unreadable adapter catalog {self.path}")
+
+    def _library(self, adapter_name: str) -> Path | None:
+        name = f"{_LIB_PREFIX}{adapter_name}{_LIB_SUFFIX}"
+        for folder in self._core.getDeviceAdapterSearchPaths():
+            if (lib := Path(folder) / name).is_file():
+                return lib
+        return None
+
+    def _key(self, adapter_name: str) -> list | None:
+        lib = self._library(adapter_name)
+        if lib is None:
+            return None
+        stat = lib.stat()
+        return [str(lib), stat.st_mtime_ns, stat.st_size]
+
+    def _store(self, adapter_name: str, entry: dict, key: list | None) -> None:
+        if key is not None:
+            entry["key"] = key
+            self._entries[adapter_name] = entry
+
+    def devices(self, adapter_name: str) -> list[tuple[str, int]]:
+        """Return (device, device_type) pairs available from `adapter_name`.
+
+        Raises RuntimeError if the adapter cannot be loaded.
+        """
+        key = self._key(adapter_name)
+        entry = self._entries.get(adapter_name)
+        if key is None or entry is None or entry["key"] != key:
+            logger.debug(f"Probing adapter {adapter_name!r}")
+            entry = _probe_adapter(self._core, adapter_name, test_cameras=False)
+            self._store(adapter_name, entry, key)
+        if "error" in entry:
+            raise RuntimeError(entry["error"])
+        return [(dev, int(typ)) for dev, typ in entry["devices"]]
+
+    def camera_works(self, adapter_name: str, device: str) -> bool:
+        """Return False if `device` failed an isolated load test (see `refresh`).
+
+        Failures are not saved, so only tests run since the catalog was loaded
+        count.
+        """
+        entry = self._entries.get(adapter_name, {})
+        return entry.get("cameras", {}).get(device) is None
+
+    def refresh(
+        self,
+        adapter_names: Iterable[str] | None = None,
+        timeout: float = 10,
+        max_workers: int | None = None,
+    ) -> None:
+        """Probe all changed adapters in parallel, isolated worker processes.
+
+        Cameras are load-tested too, and adapters that crash or hang are recorded
+        as errors.  See `probe_adapters`.
+        """
+        if adapter_names is None:
+            adapter_names = self._core.getDeviceAdapterNames()
+        keys = {name: self._key(name) for name in adapter_names}
+        stale = [
+            name
+            for name, key in keys.items()
+            if name not in self._entries
+            or self._entries[name].get("key") != key
+            or "cameras" not in self._entries[name]
+        ]
+        paths = self._core.getDeviceAdapterSearchPaths()
+        for name, entry in probe_adapters(stale, paths, timeout, max_workers):
+            self._store(name, entry, keys[name])
+
+    def save(self) -> None:
+        """Write the successful entries to disk, if they have changed."""
+        entries = {}
+        for name, entry in self._entries.items():
+            if "error" in entry:
+                continue
+            if any(err is not None for err in entry.get("cameras", {}).values()):
+                entry = {k: v for k, v in entry.items() if k != "cameras"}
+            entries[name] = entry
+        text = json.dumps(entries)
+        if text == self._saved:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(text)
+        os.replace(tmp, self.path)
+        self._saved = text
+
+    def clear(self) -> None:
+        """Forget all cached entries."""
+        self._entries.clear()
+
+
 class DeviceAdapter:
-    def __init__(self, adapter_name: str, core: CMMCorePlus | None = None):
-        self._core = core or CMMCorePlus.instance()
+    def __init__(
+        self,
+        adapter_name: str,
+        core: CMMCorePlus | None = None,
+        catalog: AdapterCatalog | None = None,
+    ):
+        self._core = core or _global_core()
         self._adapter_name = adapter_name
+        self._catalog = catalog
+
+    def _available(self) -> list[tuple[str, int]]:
+        if self._catalog is not None:
+            return self._catalog.devices(self._adapter_name)
+        return list(
+            zip(
+                self._core.getAvailableDevices(self._adapter_name),
+                self._core.getAvailableDeviceTypes(self._adapter_name),
+            )
+        )
 
     @property
     def works(self) -> bool:
         """Return whether the adapter works."""
         try:
-            self._core.getAvailableDevices(self._adapter_name)
+            self._available()
             return True
         except RuntimeError:
             return False
@@ -60,10 +359,9 @@ class DeviceAdapter:
         self, dtype: DeviceType | None = None
     ) -> Iterator[AvailableDevice]:
         """Get available devices from the specified device library."""
-        for dev_type, dev in zip(
-            self._core.getAvailableDeviceTypes(self._adapter_name),
-            self._core.getAvailableDevices(self._adapter_name),
-        ):
+        from pymmcore_plus import DeviceType
+
+        for dev, dev_type in self._available():
             if dtype is not None and dev_type != dtype:
                 continue
             yield AvailableDevice(
@@ -74,17 +372,45 @@ class DeviceAdapter:
         return f"DeviceAdapter({self._adapter_name!r})"
 
 
-def iter_adapters(core: CMMCorePlus) -> Iterator[DeviceAdapter]:
+def iter_adapters(
+    core: CMMCorePlus, catalog: AdapterCatalog | None = None
+) -> Iterator[DeviceAdapter]:
     for adapter_name in core.getDeviceAdapterNames():
-        yield DeviceAdapter(adapter_name, core)
+        yield DeviceAdapter(adapter_name, core, catalog)
+
+
+def load_all_cameras(
+    core: CMMCorePlus,
+    cache: bool = True,
+    isolate: bool = False,
+    timeout: float = 10,
+    refresh: bool = False,
+) -> list[Device]:
+    """Load every camera available from any adapter.
 
+    If `cache` is True, adapter enumeration goes through the on-disk
+    `AdapterCatalog`, so only adapters that changed since the last call are
+    probed (or all of them, if `refresh` is True).  If `isolate` is True, those
+    adapters are first probed (and their cameras load-tested) in parallel worker
+    processes with a per-adapter `timeout`, and cameras that crashed, hung or
+    failed there are skipped.
+    """
+    from pymmcore_plus import Device, DeviceType
 
-def load_all_cameras(core: CMMCorePlus) -> list[Device]:
+    catalog = AdapterCatalog(core) if cache or isolate else None
+    if catalog is not None and refresh:
+        catalog.clear()
+    if isolate:
+        catalog.refresh(timeout=timeout)  # type: ignore [union-attr]
     already_loaded = core.getLoadedDevicesOfType(DeviceType.CameraDevice)
     loaded = [Device(dev, core) for dev in already_loaded]
-    for adapter in iter_adapters(core):
+    for adapter in iter_adapters(core, catalog):
         try:
             for camera in adapter.iterAvailableDevices(DeviceType.CameraDevice):
+                if isolate and not catalog.camera_works(  # type: ignore [union-attr]
+                    camera.adapter, camera.device
+                ):
+                    continue
                 if camera.adapter not in already_loaded:
                     try:
                         logger.debug(f"Loading camera {camera!r}")
@@ -94,4 +420,6 @@ def load_all_cameras(core: CMMCorePlus) -> list[Device]:
                         continue
         except RuntimeError:
             continue
+    if catalog is not None and cache:
+        catalog.save()
     return loaded
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from ._ptc import Accumulator
+
+# defect kinds, as stored in the `kind` field of `DefectDetector.defects()`
+HOT, WARM, DEAD, NOISY = 1, 2, 3, 4
+DEFECT_DTYPE = np.dtype([("row", np.int32), ("col", np.int32), ("kind", np.uint8)])
+
+
+def tile_median_mad(
+    img: np.ndarray, tile: tuple[int, int] = (64, 64), stride: int = 1
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the median and MAD of each full `tile` of `img`.
+
+    The MAD is scaled by 1.4826, so that it estimates the standard deviation of
+    normally distributed data.  If `stride` > 1, the statistics are estimated
+    from every `stride`-th pixel along each axis.  Use `expand_tiles` to
+    broadcast the (n_tiles_y, n_tiles_x) results back to the image shape.
+    """
+    h, w = img.shape
+    ty, tx = min(tile[0], h), min(tile[1], w)
+    ny, nx = h // ty, w // tx
+    sub = img[: ny * ty, : nx * tx].reshape(ny, ty, nx, tx)[:, ::stride, :, ::stride]
+    tiles = sub.swapaxes(1, 2).reshape(ny, nx, -1)
+    med = np.median(tiles, axis=-1)
+    mad = 1.4826 * np.median(np.abs(tiles - med[..., np.newaxis]), axis=-1)
+    return med, mad
+
+
+def expand_tiles(
+    values: np.ndarray,
+    shape: tuple[int, int],
+    tile: tuple[int, int],
+    dtype: npt.DTypeLike | None = None,
+) -> np.ndarray:
+    """Broadcast per-tile `values` back to an image of `shape`.
+
+    Partial tiles at the edges take the value of their nearest full tile.
+    """
+    h, w = shape
+    ty, tx = min(tile[0], h), min(tile[1], w)
+    values = values.astype(dtype, copy=False)
+    full = np.repeat(np.repeat(values, ty, axis=0), tx, axis=1)
+    return np.pad(full, ((0, h - full.shape[0]), (0, w - full.shape[1])), "edge")
+
+
+class DefectDetector:
+    """Incremental hot/warm/dead/noisy pixel detection from running statistics.
+
+    Call `update` with an accumulator (e.g. a `RunningStat`) as frames arrive.
+    Pixels are compared against robust thresholds: the per-tile median plus or
+    minus a multiple of the per-tile MAD of the mean (hot, warm, dead) and
+    variance (noisy) maps.  The tile statistics are only recomputed every
+    `refresh` updates; in between, each update is a single vectorized comparison
+    against the cached thresholds.
+
+    A pixel is reported by `defects` once it has been flagged in at least
+    `confirm` consecutive updates, so the list is refined (rather than rebuilt)
+    as the statistics converge.  Updates before `stat` holds two frames (and so
+    a variance map) are ignored.
+
+    Parameters
+    ----------
+    tile : tuple[int, int], optional
+        Tile size for the median/MAD thresholds, by default (64, 64)
+    stride : int, optional
+        Estimate the tile median/MAD from every `stride`-th pixel along each axis,
+        by default 4
+    hot : float, optional
+        Number of MADs above the median for a hot pixel, by default 10
+    warm : float, optional
+        Number of MADs above the median for a warm pixel, by default 5
+    dead : float, optional
+        Number of MADs below the median for a dead pixel, by default 10
+    noisy : float, optional
+        Number of MADs above the median variance for a noisy pixel, by default 10
+    refresh : int, optional
+        Recompute the tile thresholds every `refresh` updates, by default 10
+    confirm : int, optional
+        Number of consecutive updates a pixel must be flagged, by default 2
+    min_mad : float, optional
+        Lower bound on the MAD of the mean map (in DN; its square bounds the MAD of
+        the variance map), so that flat tiles, e.g. of quantized dark frames, don't
+        flag every pixel above the median, by default 1
+    """
+
+    def __init__(
+        self,
+        tile: tuple[int, int] = (64, 64),
+        stride: int = 4,
+        hot: float = 10,
+        warm: float = 5,
+        dead: float = 10,
+        noisy: float = 10,
+        refresh: int = 10,
+        confirm: int = 2,
+        min_mad: float = 1,
+    ) -> None:
+        self.tile = tile
+        self.stride = stride
+        self.hot = hot
+        self.warm = warm
+        self.dead = dead
+        self.noisy = noisy
+        self.refresh = refresh
+        self.confirm = confirm
+        self.min_mad = min_mad
+        self.updates = 0
+        self._thresholds: tuple[np.ndarray, ...] | None = None
+        self._kind: np.ndarray | None = None  # kind of each flagged pixel
+        self._hits: np.ndarray | None = None  # consecutive updates flagged
+
+    def _compute_thresholds(self, mean: np.ndarray, var: np.ndarray) -> None:
+        m_med, m_mad = tile_median_mad(mean, self.tile, self.stride)
+        v_med, v_mad = tile_median_mad(var, self.tile, self.stride)
+        m_mad = np.maximum(m_mad, self.min_mad)
+        v_mad = np.maximum(v_mad, self.min_mad**2)
+        self._thresholds = tuple(
+            expand_tiles(t, mean.shape, self.tile, mean.dtype)
+            for t in (
+                m_med + self.hot * m_mad,
+                m_med + self.warm * m_mad,
+                m_med - self.dead * m_mad,
+                v_med + self.noisy * v_mad,
+            )
+        )
+
+    def update(self, stat: Accumulator) -> np.ndarray:
+        """Classify pixels using the current mean/variance of `stat`.
+
+        Returns the confirmed defects (see `defects`).
+        """
+        if len(stat) < 2:  # no variance map yet
+            return self.defects()
+        mean = np.asarray(stat.mean())
+        var = np.asarray(stat.var())
+        if self._thresholds is None or self.updates % self.refresh == 0:
+            self._compute_thresholds(mean, var)
+        self.updates += 1
+        hot_t, warm_t, dead_t, noisy_t = self._thresholds  # type: ignore [misc]
+
+        # later assignments take precedence
+        kind = np.multiply(var > noisy_t, NOISY, dtype=np.uint8)
+        np.copyto(kind, DEAD, where=mean < dead_t)
+        np.copyto(kind, WARM, where=mean > warm_t)
+        np.copyto(kind, HOT, where=mean > hot_t)
+
+        if self._hits is None or self._hits.shape != kind.shape:
+            self._hits = np.zeros(kind.shape, np.uint32)
+            self._kind = kind
+        # a pixel's streak continues only while it keeps the same classification
+        same = (kind == self._kind) & (kind > 0)
+        np.add(self._hits, 1, out=self._hits, where=same)
+        self._hits[~same] = kind[~same] > 0
+        self._kind = kind
+        return self.defects()
+
+    def defects(self) -> np.ndarray:
+        """Return confirmed defects, as a structured array of (row, col, kind)."""
+        if self._hits is None or self._kind is None:
+            return np.empty(0, DEFECT_DTYPE)
+        rows, cols = np.nonzero(self._hits >= self.confirm)
+        out = np.empty(len(rows), DEFECT_DTYPE)
+        out["row"] = rows
+        out["col"] = cols
+        out["kind"] = self._kind[rows, cols]
+        return out
@@ -1,12 +1,21 @@
 """
 code from my napari histogram PR
 """
-from typing import cast
+import threading
+import time
+from typing import TYPE_CHECKING, cast
 from vispy.plot import Fig, PlotWidget
 from vispy import scene, visuals
+from qtpy.QtCore import QObject, QTimer, Signal  # type: ignore [attr-defined]
+from qtpy.QtGui import QCloseEvent
 from qtpy.QtWidgets import QWidget, QHBoxLayout
 import numpy as np
 
+from ._ptc import rebin_counts
+
+if TYPE_CHECKING:
+    from ._shm import SharedRing
+
 
 class PanZoom1DCamera(scene.cameras.PanZoomCamera):
     def __init__(self, axis: int = 1, *args, **kwargs):
@@ -131,6 +140,24 @@ class _PlotWidget(PlotWidget):
         self.yaxis.link_view(self.view)
 
 
+def calc_histogram(
+    data: np.ndarray, bins: int, stride: int = 1
+) -> tuple[np.ndarray, np.ndarray]:
+    """Histogram `data` into `bins` bins spanning its range, like `np.histogram`.
+
+    uint8/uint16 data takes a fast path: a `bincount` over the pixel values, folded
+    into `bins` bins using cached edges.  If `stride` > 1, only every `stride`-th
+    pixel along each axis is counted.
+    """
+    data = np.asarray(data)
+    if stride > 1:
+        data = data[(slice(None, None, stride),) * data.ndim]
+    if data.dtype not in (np.uint8, np.uint16) or not data.size:
+        return np.histogram(data, bins)
+
+    return rebin_counts(np.bincount(data.ravel()), bins)
+
+
 class HistogramVisual(visuals.MeshVisual):
     """Visual that calculates and displays a histogram of data
 
@@ -153,6 +180,8 @@ class HistogramVisual(visuals.MeshVisual):
             raise ValueError('orientation must be "h" or "v", not %s' % (orientation,))
         self._orientation = orientation
         self._bins = bins
+        self._rr: np.ndarray | None = None
+        self._tris: np.ndarray | None = None
         rr, tris = self._calc_hist(data, bins)
         visuals.MeshVisual.__init__(self, rr, tris, color=color)
 
@@ -164,38 +193,152 @@ class HistogramVisual(visuals.MeshVisual):
         data = np.asarray(data)
         if data.ndim != 1:
             raise ValueError("Only 1D data currently supported")
+        return self._calc_mesh(*calc_histogram(data, self._bins))
 
+    def _calc_mesh(
+        self, counts: np.ndarray, bin_edges: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
         X, Y = (0, 1) if self._orientation == "h" else (1, 0)
-        # do the histogramming
-        data, bin_edges = np.histogram(data, self._bins)
+        nbins = len(counts)
+        # the triangles depend only on the number of bins: reuse the buffers
+        if self._rr is None or self._tris is None or len(self._tris) != 2 * nbins:
+            self._rr = np.zeros((3 * nbins + 1, 3), np.float32)
+            self._tris = np.zeros((2 * nbins, 3), np.uint32)
+            offsets = 3 * np.arange(nbins, dtype=np.uint32)[:, np.newaxis]
+            tri_1 = np.array([0, 2, 1])
+            tri_2 = np.array([2, 0, 3])
+            self._tris[::2] = tri_1 + offsets
+            self._tris[1::2] = tri_2 + offsets
+
         # construct our vertices
-        rr = np.zeros((3 * len(bin_edges) - 2, 3), np.float32)
+        rr = self._rr
         rr[:, X] = np.repeat(bin_edges, 3)[1:-1]
-        rr[1::3, Y] = data
-        rr[2::3, Y] = data
-        bin_edges.astype(np.float32)
-        # and now our tris
-        tris = np.zeros((2 * len(bin_edges) - 2, 3), np.uint32)
-        offsets = 3 * np.arange(len(bin_edges) - 1, dtype=np.uint32)[:, np.newaxis]
-        tri_1 = np.array([0, 2, 1])
-        tri_2 = np.array([2, 0, 3])
-        tris[::2] = tri_1 + offsets
-        tris[1::2] = tri_2 + offsets
-        return rr, tris
+        rr[1::3, Y] = counts
+        rr[2::3, Y] = counts
+        return rr, self._tris
 
     def set_data(self, data: np.ndarray, bins: int | None = None) -> None:
         rr, tris = self._calc_hist(data, bins)
         super().set_data(vertices=rr, faces=tris)
 
+    def set_histogram(self, counts: np.ndarray, bin_edges: np.ndarray) -> None:
+        """Display precomputed `counts`, with len(counts) + 1 `bin_edges`."""
+        rr, tris = self._calc_mesh(counts, bin_edges)
+        super().set_data(vertices=rr, faces=tris)
+
 
 HistogramNode = scene.visuals.create_visual_node(HistogramVisual)
 
 
+class _HistogramWorker(QObject):
+    """Histograms frames on a background thread, keeping only the newest frame.
+
+    Frames submitted while the previous one is still being histogrammed (or while
+    the worker waits, to produce at most `max_fps` results a second) replace each
+    other (the stale ones are counted in `skipped`), so the worker never falls
+    behind.  `ready` is emitted for each result, which the GUI thread collects
+    with `take`.  `close` stops the thread and waits for it.
+    """
+
+    ready = Signal()
+
+    def __init__(self, bins: int, stride: int = 1, max_fps: float = 30) -> None:
+        super().__init__()
+        self.bins = bins
+        self.stride = stride
+        self.max_fps = max_fps
+        self.skipped = 0
+        self._pending: np.ndarray | None = None
+        self._result: tuple[np.ndarray, np.ndarray] | None = None
+        self._stopping = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, data: np.ndarray) -> None:
+        with self._cond:
+            if self._pending is not None:
+                self.skipped += 1
+            self._pending = data
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Stop the worker thread (dropping any pending frame), and join it."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+    def take(self) -> tuple[np.ndarray, np.ndarray] | None:
+        """Return the newest (counts, bin_edges) not yet taken, if any."""
+        with self._cond:
+            result, self._result = self._result, None
+        return result
+
+    def _run(self) -> None:
+        last = -np.inf
+        while True:
+            with self._cond:
+                while True:
+                    wait = last + 1 / self.max_fps - time.perf_counter()
+                    if self._stopping or (self._pending is not None and wait <= 0):
+                        break
+                    self._cond.wait(wait if self._pending is not None else None)
+                if self._stopping or self._pending is None:
+                    return
+                data, self._pending = self._pending, None
+            result = calc_histogram(data, self.bins, self.stride)
+            last = time.perf_counter()
+            with self._cond:
+                if self._stopping:
+                    return
+                self._result = result
+            self.ready.emit()
+
+
 class Histogram(QWidget):
-    def __init__(self, data=None, bins=100, parent: QWidget | None = None):
+    """Histogram of the most recently snapped image.
+
+    Parameters
+    ----------
+    data : np.ndarray, optional
+        Initial data, by default None.
+    bins : int, optional
+        Number of bins, by default 100.
+    parent : QWidget | None, optional
+        Parent widget, by default None.
+    stride : int, optional
+        Only histogram every `stride`-th pixel along each axis, by default 1.
+    threaded : bool, optional
+        Whether to compute histograms on a worker thread, by default True.  When
+        images arrive faster than they can be histogrammed, only the newest one
+        is used, and the display is refreshed at most `max_fps` times a second.
+        The thread is stopped when the widget is closed or destroyed.
+    max_fps : float, optional
+        Maximum refresh rate of the display when `threaded`, by default 30.
+    """
+
+    def __init__(
+        self,
+        data=None,
+        bins=100,
+        parent: QWidget | None = None,
+        stride: int = 1,
+        threaded: bool = True,
+        max_fps: float = 30,
+    ):
         super().__init__(parent)
         from pymmcore_plus import CMMCorePlus
 
+        self._stride = stride
+        self._max_fps = max_fps
+        self._worker: _HistogramWorker | None = None
+        if threaded:
+            self._worker = _HistogramWorker(bins, stride, max_fps)
+            self._worker.ready.connect(self._on_worker_ready)
+            self.destroyed.connect(self._worker.close)
+
         self._mmc = CMMCorePlus.instance()
         self._mmc.events.imageSnapped.connect(self.set_data)
 
@@ -214,10 +357,41 @@ class Histogram(QWidget):
         self.layout().addWidget(self._fig.native)
         self.setMaximumHeight(200)
 
+        if data is not None:
+            self.set_data(data)
+
     def set_data(self, data: np.ndarray) -> None:
-        self._hist.set_data(data.ravel())
+        if self._worker is not None:
+            self._worker.submit(data)
+        else:
+            self.set_histogram(*calc_histogram(data, self.bins, self._stride))
+
+    def set_histogram(self, counts: np.ndarray, bin_edges: np.ndarray) -> None:
+        """Display precomputed `counts`, with len(counts) + 1 `bin_edges`."""
+        self._hist.set_histogram(counts, bin_edges)
         self.autoscale()
 
+    def subscribe(self, ring: "SharedRing") -> QTimer:
+        """Show the newest frame of a `SharedRing` (e.g. `AcquisitionWorker.frames`).
+
+        Returns the polling QTimer; stop it to unsubscribe.
+        """
+        from ._shm import poll
+
+        def _show(seq: int, tag: int, frame: np.ndarray) -> None:
+            self.set_data(frame)
+
+        return poll(ring, _show, self._max_fps, self)
+
+    def _on_worker_ready(self) -> None:
+        if self._worker is not None and (result := self._worker.take()) is not None:
+            self.set_histogram(*result)
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        if self._worker is not None:
+            self._worker.close()
+        super().closeEvent(event)
+
     def autoscale(self):
         verts = self._hist._meshdata.get_vertices()
         x0, y0, _ = np.min(verts, axis=0)
@@ -231,3 +405,20 @@ class Histogram(QWidget):
     @bins.setter
     def bins(self, value: int) -> None:
         self._hist._bins = value
+        if self._worker is not None:
+            self._worker.bins = value
+
+    @property
+    def stride(self) -> int:
+        return self._stride
+
+    @stride.setter
+    def stride(self, value: int) -> None:
+        self._stride = value
+        if self._worker is not None:
+            self._worker.stride = value
+
+    @property
+    def skipped(self) -> int:
+        """Number of stale images that were dropped by the worker thread."""
+        return self._worker.skipped if self._worker is not None else 0
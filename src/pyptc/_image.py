@@ -1,19 +1,81 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional, cast
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union, cast
 
+import numpy as np
 from pymmcore_plus import CMMCorePlus
+from qtpy.QtCore import QTimer
 from qtpy.QtWidgets import QVBoxLayout, QWidget
 from vispy import scene
 
-
 if TYPE_CHECKING:
-    import numpy as np
+    from ._shm import AcquisitionWorker
+
+
+# number of bins of the histogram that float contrast limits are read from
+CLIM_BINS = 4096
+
+
+def calc_clims(
+    img: np.ndarray, percentiles: tuple[float, float] = (0, 100), stride: int = 1
+) -> tuple[float, float]:
+    """Return contrast limits at the given `percentiles` of `img`.
+
+    Only every `stride`-th pixel along each axis is considered.  Rather than
+    sorting, the limits are read off a cumulative `bincount` histogram: of the
+    codes of uint8/uint16 images, and of `CLIM_BINS` bins spanning the range of
+    other images (so float limits are accurate to within a bin).
+    """
+    img = np.asarray(img)
+    if stride > 1:
+        img = img[(slice(None, None, stride),) * img.ndim]
+    if img.dtype in (np.uint8, np.uint16):
+        cdf = np.cumsum(np.bincount(img.ravel()))
+        lower = upper = np.arange(cdf.size, dtype=float)  # one bin per code
+    else:
+        # a contiguous copy of the subsample is much faster to reduce than a view
+        x = np.array(img, np.result_type(img.dtype, np.float32), order="C")
+        lo, hi = float(x.min()), float(x.max())
+        if not hi > lo:  # constant (or NaN)
+            return lo, hi
+        x -= lo
+        x *= CLIM_BINS / (hi - lo)
+        idx = x.astype(np.intp).ravel()
+        np.minimum(idx, CLIM_BINS - 1, out=idx)
+        cdf = np.cumsum(np.bincount(idx, minlength=CLIM_BINS))
+        edges = np.linspace(lo, hi, CLIM_BINS + 1)
+        lower, upper = edges[:-1], edges[1:]
+
+    lo, hi = np.multiply(percentiles, cdf[-1] / 100)
+    # the bins holding the percentiles: the low limit is the lower edge of its bin,
+    # and the high limit the upper edge of its bin
+    return (
+        float(lower[np.searchsorted(cdf, lo, "right")]),
+        float(upper[np.searchsorted(cdf, hi)]),
+    )
 
 
 class ImageView(scene.widgets.ViewBox):
+    """A view of a single image, with automatic contrast limits.
+
+    Contrast limits are set to the `clim_percentiles` of the image (computed on
+    every `clim_stride`-th pixel along each axis, so that a few hot pixels don't
+    ruin the contrast), every `autoscale_every` calls to `set_data` (0 to
+    disable).  With `clim_smoothing` > 0, the limits follow an exponential moving
+    average: new = smoothing * old + (1 - smoothing) * measured.
+    """
+
+    clim_percentiles: tuple[float, float] = (0.1, 99.9)
+    clim_stride: int = 4
+    clim_smoothing: float = 0
+    autoscale_every: int = 1
+
     def __init__(self, *args, **kwargs):
         self.image = scene.visuals.Image(cmap="grays")
+        self._clim: tuple[float, float] | None = None
+        self._frames = 0
         super().__init__(*args, **kwargs)
         self.camera = scene.PanZoomCamera(aspect=1)
         self.add(self.image)
@@ -21,11 +83,20 @@ class ImageView(scene.widgets.ViewBox):
     def set_data(self, img: np.ndarray) -> None:
         self.image.set_data(img)
         self.camera.set_range(margin=0)
-        self.autoscale()
+        if self.autoscale_every and self._frames % self.autoscale_every == 0:
+            self.autoscale(smooth=True)
+        self._frames += 1
 
-    def autoscale(self) -> None:
+    def autoscale(self, smooth: bool = False) -> None:
         img = self.image._data
-        clim = (img.min(), img.max())
+        clim = calc_clims(img, self.clim_percentiles, self.clim_stride)
+        if smooth and self.clim_smoothing and self._clim is not None:
+            a = self.clim_smoothing
+            clim = (
+                a * self._clim[0] + (1 - a) * clim[0],
+                a * self._clim[1] + (1 - a) * clim[1],
+            )
+        self._clim = clim
         self.image.clim = clim
 
     @property
@@ -37,6 +108,66 @@ class ImageView(scene.widgets.ViewBox):
         self.image.cmap = value
 
 
+PanelData = Union[np.ndarray, Callable[[], np.ndarray]]
+
+
+class RenderScheduler:
+    """Coalesces updates to the panels of an `Image`, and draws at a capped rate.
+
+    `post` may be called from any thread, and only keeps the most recent data for
+    each panel (replaced updates, and those dropped earlier and reported with
+    `skip`, are counted in `skipped`).  Pending updates are drawn on the GUI
+    thread at most `max_fps` times per second (or whenever the event loop is idle
+    if `max_fps` is 0), so producers never wait on rendering.
+
+    Data is not copied: post a snapshot if the producer will modify it in place
+    (e.g. the live ``stat.mean()`` of a `RunningStat`).  A function returning the
+    data may be posted instead; it is called on the GUI thread when the panel is
+    drawn, so it must be safe to call from there.
+    """
+
+    def __init__(self, image: Image, max_fps: float = 30) -> None:
+        self._image = image
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[int, int], PanelData] = {}
+        self.skipped = 0
+        self.drawn = 0
+        self._timer = QTimer(image)
+        self._timer.timeout.connect(self.flush)
+        self.max_fps = max_fps
+
+    @property
+    def max_fps(self) -> float:
+        return self._max_fps
+
+    @max_fps.setter
+    def max_fps(self, value: float) -> None:
+        if value < 0:
+            raise ValueError(f"max_fps must be >= 0, got {value}")
+        self._max_fps = value
+        self._timer.start(int(1000 / value) if value else 0)
+
+    def post(self, key: tuple[int, int], data: PanelData) -> None:
+        """Schedule `data` to be shown in panel `key`."""
+        with self._lock:
+            if key in self._pending:
+                self.skipped += 1
+            self._pending[key] = data
+
+    def skip(self, count: int = 1) -> None:
+        """Count `count` updates that were dropped before being posted."""
+        with self._lock:
+            self.skipped += count
+
+    def flush(self) -> None:
+        """Draw all pending updates now (must be called on the GUI thread)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for key, data in pending.items():
+            self._image[key].set_data(data() if callable(data) else data)
+            self.drawn += 1
+
+
 class Image(QWidget):
     def __init__(
         self,
@@ -44,6 +175,7 @@ class Image(QWidget):
         camera="panzoom",
         size=(512, 512),
         data=None,
+        max_fps: float = 30,
     ):
         super().__init__(parent)
         self._mmc = CMMCorePlus.instance()
@@ -51,6 +183,7 @@ class Image(QWidget):
         self._canvas = scene.SceneCanvas(keys="interactive", show=True, size=size)
         self._grid = self._canvas.central_widget.add_grid()
         self._grid._default_class = ImageView
+        self.scheduler = RenderScheduler(self, max_fps)
 
         if data is not None:
             self[0, 0].set_data(data)
@@ -62,6 +195,72 @@ class Image(QWidget):
     def __getitem__(self, key: tuple[int, int]) -> ImageView:
         return self._grid[key]
 
+    def post(self, key: tuple[int, int], data: PanelData) -> None:
+        """Thread-safe, rate-limited `self[key].set_data(data)`.
+
+        See `RenderScheduler` for details.
+        """
+        self.scheduler.post(key, data)
+
+    def stats_callback(
+        self, mean_key: tuple[int, int] = (0, 0), var_key: tuple[int, int] = (1, 0)
+    ) -> Callable[[Any, Any], None]:
+        """Return a `collect_stats` callback showing the running mean and variance.
+
+        The callback copies the statistics (on the acquisition thread, between
+        pushes, so mean and variance are consistent) at most `scheduler.max_fps`
+        times a second, and only posts the copies to the scheduler, so it can run
+        on an acquisition thread at full speed.  Updates dropped in between are
+        counted in `scheduler.skipped`.  Statistics pushed after the last
+        snapshot are not shown: post ``stat.mean()`` when collection ends if
+        needed.
+        """
+        last = -np.inf
+
+        def _callback(img: Any, stat: Any) -> None:
+            nonlocal last
+            now = time.perf_counter()
+            fps = self.scheduler.max_fps
+            if fps and (now - last) * fps < 1:
+                self.scheduler.skip(2)  # the mean and the variance
+                return
+            last = now
+            self.post(mean_key, np.array(stat.mean()))
+            self.post(var_key, np.array(stat.var()))
+
+        return _callback
+
+    def subscribe(
+        self,
+        worker: AcquisitionWorker,
+        mean_key: tuple[int, int] = (0, 0),
+        var_key: tuple[int, int] = (1, 0),
+        frame_key: tuple[int, int] | None = None,
+    ) -> list[QTimer]:
+        """Show the running mean and variance (and frames) of an `AcquisitionWorker`.
+
+        The worker's shared-memory rings are polled on the GUI thread at
+        `scheduler.max_fps`, so acquisition runs at full speed, however slow
+        drawing is.  Returns the polling QTimers; stop them to unsubscribe.
+        """
+        from ._shm import poll
+
+        if worker.frames is None or worker.stats is None:
+            raise RuntimeError("The worker must be started before subscribing")
+        fps = self.scheduler.max_fps
+
+        def _stats(seq: int, n: int, data: np.ndarray) -> None:
+            self[mean_key].set_data(data[0])
+            self[var_key].set_data(data[1])
+
+        def _frame(seq: int, index: int, frame: np.ndarray) -> None:
+            self[frame_key].set_data(frame)  # type: ignore [index]
+
+        timers = [poll(worker.stats, _stats, fps, self)]
+        if frame_key is not None:
+            timers.append(poll(worker.frames, _frame, fps, self))
+        return timers
+
     def autoscale(self) -> None:
         for (*_, wdg) in self._grid._grid_widgets.values():
             wdg.autoscale()
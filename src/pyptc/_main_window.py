@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from pymmcore_widgets import ImagePreview
 from ._widgets import PTCControls
 from qtpy.QtWidgets import QHBoxLayout, QMainWindow, QWidget
 
+if TYPE_CHECKING:
+    from ._shm import AcquisitionWorker
+
 
 class MainWindow(QMainWindow):
     def __init__(self, parent: QWidget | None = None):
@@ -15,9 +20,25 @@ class MainWindow(QMainWindow):
         self._controls = PTCControls(self)
 
         central = QWidget()
-        central.setLayout(QHBoxLayout())
-        central.layout().addWidget(self._image)
-        central.layout().addWidget(self._controls)
+        self._layout = QHBoxLayout(central)
+        self._layout.addWidget(self._image)
+        self._layout.addWidget(self._controls)
         self.setCentralWidget(central)
 
         self.resize(900, 600)
+
+    def subscribe(self, worker: AcquisitionWorker) -> None:
+        """Show the frames and statistics of an `AcquisitionWorker` process.
+
+        The histogram follows the worker's frames, and a mean/variance `Image` is
+        added next to the preview.  Both only read the worker's shared memory, at
+        their own refresh rate.
+        """
+        from ._image import Image
+
+        if worker.frames is None:
+            raise RuntimeError("The worker must be started before subscribing")
+        self._controls.histogram.subscribe(worker.frames)
+        self._stats_image = Image(self)
+        self._stats_image.subscribe(worker)
+        self._layout.insertWidget(1, self._stats_image)
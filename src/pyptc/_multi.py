@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Mapping
+
+import numpy as np
+
+from ._ptc import Accumulator, RunningStat, collect_stats
+from ._sequence import collect_sequence_stats
+
+if TYPE_CHECKING:
+    from pymmcore_plus import CMMCorePlus
+
+SnapSource = Callable[[], Callable[[], np.ndarray]]
+
+
+@dataclass
+class CameraRun:
+    """Statistics and throughput metrics of one camera in a multi-camera run.
+
+    Attributes
+    ----------
+    camera : str
+        The camera (or Multi Camera channel) name.
+    stat : Accumulator
+        The camera's statistics.  ``stat.timings`` holds its `FrameTimings`, if
+        collected with ``timings=True``.
+    elapsed : float
+        Wall time of the collection, in seconds.
+    frame_bytes : int
+        Size of one frame, in bytes.
+
+    `dropped` is the number of frames lost by a sequence acquisition (see
+    `collect_cameras`); it is always 0 for snapped frames.
+    """
+
+    camera: str
+    stat: Accumulator
+    elapsed: float
+    frame_bytes: int
+
+    @property
+    def frames(self) -> int:
+        return len(self.stat)
+
+    @property
+    def dropped(self) -> int:
+        return self.stat.dropped
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.fps * self.frame_bytes / 1e6
+
+
+@dataclass(frozen=True)
+class CameraSource:
+    """A picklable recipe for a core driving a single camera, in a worker process.
+
+    Calling it creates a new (non-global) core, loads and initializes only this
+    camera (so that each process opens only its own hardware), applies
+    `properties`, and returns the core's `snap`.  `core` returns the core itself,
+    for sequence acquisitions.
+
+    Parameters
+    ----------
+    adapter : str
+        Device adapter name, e.g. "DemoCamera".
+    device : str
+        Device name, e.g. "DCam".
+    properties : Mapping[str, str], optional
+        Camera properties to set after initialization.
+    adapter_paths : tuple[str, ...], optional
+        Where to find adapters, by default the Micro-Manager installation found by
+        pymmcore_plus.
+    """
+
+    adapter: str
+    device: str
+    properties: Mapping[str, str] = field(default_factory=dict)
+    adapter_paths: tuple[str, ...] = ()
+
+    def core(self) -> CMMCorePlus:
+        from ._core_utils import _core_class
+
+        core = _core_class()(adapter_paths=self.adapter_paths)
+        core.loadDevice("Camera", self.adapter, self.device)
+        core.initializeDevice("Camera")
+        core.setCameraDevice("Camera")
+        for prop, value in self.properties.items():
+            core.setProperty("Camera", prop, value)
+        return core
+
+    def __call__(self) -> Callable[[], np.ndarray]:
+        return self.core().snap
+
+
+def _run_source(
+    name: str,
+    source: SnapSource,
+    n: int,
+    stat_type: Callable[[], Accumulator],
+    timings: bool,
+    sequence: int = 0,
+) -> CameraRun:
+    frame_bytes = 0
+
+    def _measure(img: np.ndarray, stat: Accumulator) -> None:
+        nonlocal frame_bytes
+        frame_bytes = img.nbytes
+
+    if sequence:
+        core = getattr(source, "core", None)
+        if core is None:
+            raise TypeError(f"Sequence acquisition from {name!r} needs a `core()`")
+        t0 = time.perf_counter()
+        stat = collect_sequence_stats(
+            core(), n, _measure, buffer_size=sequence, block=False, stat=stat_type()
+        )
+    else:
+        snap = source()
+        t0 = time.perf_counter()
+        stat = collect_stats(snap, n, _measure, stat_type(), timings=timings)
+    return CameraRun(name, stat, time.perf_counter() - t0, frame_bytes)
+
+
+def collect_cameras(
+    sources: Mapping[str, SnapSource],
+    n: int = 100,
+    stat_type: Callable[[], Accumulator] = RunningStat,
+    executor: Executor | None = None,
+    timings: bool = False,
+    sequence: int = 0,
+) -> dict[str, CameraRun]:
+    """Collect statistics from several cameras in parallel, one core per camera.
+
+    Each source is called in a worker to create its `snap` function (e.g. a
+    `CameraSource`, which creates a core in that process), and `n` frames are
+    collected from it with `collect_stats`, into its own accumulator.
+
+    With `sequence`, each camera instead runs a sequence acquisition, with
+    `collect_sequence_stats` and a ring of `sequence` frames, from the core
+    returned by its source's ``core()``.  Frames that the camera fails to
+    deliver, or that arrive while the ring is full, are counted in each run's
+    `dropped`.
+
+    Parameters
+    ----------
+    sources : Mapping[str, SnapSource]
+        Camera names, and picklable callables returning a snap function.
+    n : int, optional
+        The number of images to take from each camera, by default 100
+    stat_type : Callable[[], Accumulator], optional
+        Factory for each camera's accumulator (must be picklable), by default
+        RunningStat.
+    executor : Executor | None, optional
+        The executor to run the cameras in, by default a process pool (spawned,
+        so each camera gets a fresh core) with one process per camera.
+    timings : bool, optional
+        Collect per-frame `FrameTimings` for each camera, by default False.  Not
+        supported with `sequence`.
+    sequence : int, optional
+        If nonzero, the size of the ring buffer of a sequence acquisition, by
+        default 0 (snap each frame).
+
+    Returns
+    -------
+    dict[str, CameraRun]
+        Each camera's statistics and throughput metrics.
+    """
+    if timings and sequence:
+        raise ValueError("timings are not recorded for sequence acquisitions")
+    if executor is None:
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(len(sources) or 1, mp_context=ctx) as pool:
+            return collect_cameras(sources, n, stat_type, pool, timings, sequence)
+    futures = {
+        name: executor.submit(_run_source, name, src, n, stat_type, timings, sequence)
+        for name, src in sources.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
+
+
+def collect_multicamera_stats(
+    core: CMMCorePlus,
+    n: int = 100,
+    stat_type: Callable[[], Accumulator] = RunningStat,
+    callback: Callable | None = None,
+) -> dict[str, CameraRun]:
+    """Collect statistics from every channel of a Multi Camera device.
+
+    With the Micro-Manager "Multi Camera" utility device as the current camera,
+    each `snapImage` exposes all physical cameras at once; their images are then
+    read with ``getImage(channel)``.  Each channel gets its own accumulator.
+
+    Parameters
+    ----------
+    core : CMMCorePlus
+        The core to acquire from, with a Multi Camera as its current camera.
+    n : int, optional
+        The number of images to take, by default 100
+    stat_type : Callable[[], Accumulator], optional
+        Factory for each channel's accumulator, by default RunningStat.
+    callback : Callable | None, optional
+        Called after each snap as ``callback(images, stats)``, with lists of the
+        images and accumulators, one per channel.
+
+    Returns
+    -------
+    dict[str, CameraRun]
+        Statistics and throughput metrics, by channel name.
+    """
+    names = [
+        core.getCameraChannelName(i) for i in range(core.getNumberOfCameraChannels())
+    ]
+    stats = [stat_type() for _ in names]
+    images: list[np.ndarray] = []
+    t0 = time.perf_counter()
+    for _ in range(n):
+        core.snapImage()
+        images = [core.getImage(i) for i in range(len(names))]
+        for img, stat in zip(images, stats):
+            stat.push(img)
+        if callback is not None:
+            callback(images, stats)
+    elapsed = time.perf_counter() - t0
+    for stat in stats:
+        stat.frozen = True
+    frame_bytes = [img.nbytes for img in images] or [0] * len(names)
+    return {
+        name: CameraRun(name, stat, elapsed, nbytes)
+        for name, stat, nbytes in zip(names, stats, frame_bytes)
+    }
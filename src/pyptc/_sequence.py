@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import queue
+import threading
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+
+from ._ptc import Accumulator, RunningStat
+
+if TYPE_CHECKING:
+    from pymmcore_plus import CMMCorePlus
+
+
+class FrameRing:
+    """Bounded ring of preallocated frame buffers.
+
+    A single producer claims a free slot, copies a frame into it and publishes
+    it; a single consumer gets published slots and releases them when done.
+    Buffers are allocated once, from the first frame that is written.
+
+    Parameters
+    ----------
+    size : int, optional
+        Number of frames that the ring can hold, by default 8
+    """
+
+    def __init__(self, size: int = 8) -> None:
+        self.size = size
+        self.frames: np.ndarray | None = None
+        self._free: queue.Queue[int] = queue.Queue()
+        self._ready: queue.Queue[int | None] = queue.Queue()
+        for i in range(size):
+            self._free.put(i)
+
+    def put(self, img: np.ndarray, timeout: float | None = None) -> bool:
+        """Copy `img` into a free slot and publish it.
+
+        Blocks for at most `timeout` seconds (forever if None) waiting for a free
+        slot, and returns False if none became available.
+        """
+        try:
+            idx = self._free.get(timeout=timeout)
+        except queue.Empty:
+            return False
+        if self.frames is None:
+            self.frames = np.empty((self.size, *img.shape), img.dtype)
+        self.frames[idx] = img
+        self._ready.put(idx)
+        return True
+
+    def close(self) -> None:
+        """Signal the consumer that no more frames will be published."""
+        self._ready.put(None)
+
+    def get(self) -> int | None:
+        """Return the index of the next published slot, or None once closed."""
+        return self._ready.get()
+
+    def release(self, idx: int) -> None:
+        """Return slot `idx` to the producer."""
+        self._free.put(idx)
+
+    def depth(self) -> int:
+        """Number of published frames waiting to be consumed."""
+        return self._ready.qsize()
+
+
+class _SequenceProducer(threading.Thread):
+    MIN_WAIT = 0.0002  # s, between polls of an idle core (doubling up to MAX_WAIT)
+    MAX_WAIT = 0.005
+
+    def __init__(
+        self, core: CMMCorePlus, n: int, ring: FrameRing, block: bool = True
+    ) -> None:
+        super().__init__(daemon=True)
+        self.core = core
+        self.n = n
+        self.ring = ring
+        self.block = block
+        self.received = 0
+        self.dropped = 0
+        self.error: BaseException | None = None
+        self.stop_event = threading.Event()
+
+    def run(self) -> None:
+        core = self.core
+        delay = self.MIN_WAIT
+        try:
+            core.startSequenceAcquisition(self.n, 0, True)
+            while self.received < self.n and not self.stop_event.is_set():
+                if not core.getRemainingImageCount():
+                    if not core.isSequenceRunning():
+                        break
+                    # the core can't notify us of new frames: back off while it
+                    # is idle, but wake up at once when asked to stop
+                    self.stop_event.wait(delay)
+                    delay = min(2 * delay, self.MAX_WAIT)
+                    continue
+                delay = self.MIN_WAIT
+                img = core.popNextImage()
+                self.received += 1
+                if not self._put(img):
+                    self.dropped += 1
+        except BaseException as e:
+            self.error = e
+        finally:
+            core.stopSequenceAcquisition()
+            # frames the camera never delivered (e.g. circular buffer overflow)
+            if not self.stop_event.is_set():
+                self.dropped += self.n - self.received
+            self.ring.close()
+
+    def _put(self, img: np.ndarray) -> bool:
+        if not self.block:
+            return self.ring.put(img, timeout=0)
+        # backpressure: wait for the consumer, but stay responsive to `stop`
+        while not self.stop_event.is_set():
+            if self.ring.put(img, timeout=0.1):
+                return True
+        return False
+
+
+def collect_sequence_stats(
+    core: CMMCorePlus,
+    n: int = 100,
+    callback: Callable | None = None,
+    buffer_size: int = 8,
+    block: bool = True,
+    stat: Accumulator | None = None,
+) -> Accumulator:
+    """Collect running mean/variance of images from a sequence acquisition.
+
+    A producer thread runs `core.startSequenceAcquisition` and copies frames
+    from `core.popNextImage` into a preallocated ring buffer, while the calling
+    thread folds them into an accumulator, so readout and statistics overlap.
+
+    Parameters
+    ----------
+    core : CMMCorePlus
+        The core to acquire from, using its current camera.
+    n : int, optional
+        The number of images to take, by default 100
+    callback : Callable | None, optional
+        A function to call after each image is pushed, by default None.
+        Will be called with args: (img: np.ndarray, stat: Accumulator).  `img` is
+        a view into the ring buffer and is only valid during the call.
+    buffer_size : int, optional
+        Number of frames in the ring buffer, by default 8
+    block : bool, optional
+        What to do when the ring buffer is full.  If True (the default) the
+        producer waits for the consumer, leaving frames in the core's circular
+        buffer.  If False, the frame is dropped.
+    stat : Accumulator | None, optional
+        The accumulator to push images into, by default a new `RunningStat`.  As
+        with `collect_stats`, a `stat` that already holds images is not cleared:
+        collection resumes, and only the remaining ``n - len(stat)`` images are
+        acquired.
+
+    Returns
+    -------
+    Accumulator
+        The running statistics of the stack.  Use stat.mean() and stat.var().
+        `stat.dropped` counts the frames that were lost, either to a full ring
+        buffer or because the camera stopped early.
+    """
+    if stat is None:
+        stat = RunningStat()
+    ring = FrameRing(buffer_size)
+    producer = _SequenceProducer(core, n - len(stat), ring, block=block)
+    producer.start()
+    try:
+        while (idx := ring.get()) is not None:
+            img = ring.frames[idx]  # type: ignore [index]
+            stat.push(img)
+            if callback is not None:
+                callback(img, stat)
+            ring.release(idx)
+    finally:
+        producer.stop_event.set()
+        producer.join()
+        stat.dropped += producer.dropped
+        stat.frozen = True
+    if producer.error is not None:
+        raise producer.error
+    return stat
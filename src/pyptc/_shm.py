@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Any, Callable
+
+import numpy as np
+import numpy.typing as npt
+
+from ._ptc import Accumulator, RunningStat
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
+    from qtpy.QtCore import QObject, QTimer
+
+    from ._multi import SnapSource
+
+_HEADER = 2  # int64s before the per-slot (lock, tag) pairs: latest seq, reserved
+_ALIGN = 64
+
+
+@dataclass(frozen=True)
+class RingSpec:
+    """Everything needed to attach to a `SharedRing` from another process."""
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+    slots: int
+
+    @property
+    def header_bytes(self) -> int:
+        n = 8 * (_HEADER + 2 * self.slots)
+        return -(-n // _ALIGN) * _ALIGN
+
+    @property
+    def nbytes(self) -> int:
+        item = int(np.prod(self.shape)) * np.dtype(self.dtype).itemsize
+        return self.header_bytes + self.slots * item
+
+
+class SharedRing:
+    """A ring of frames in shared memory, with one writer and any number of readers.
+
+    The writer never waits for readers: `publish` copies an array into the next
+    slot, overwriting the oldest one.  Every published item gets a sequence number
+    (1, 2, ...) and an integer `tag` (e.g. the frame index, or the number of
+    frames in a statistics snapshot).  Each slot is guarded by a seqlock (odd
+    while being written), so readers detect, and retry, reads of a slot that was
+    overwritten under them, and nothing is pickled per frame.
+
+    Use `SharedRing.create` in the writing process, and ``SharedRing(spec)`` with
+    its `spec` to attach in others.  The `owner` frees the shared memory on
+    `close`: by default the creator, but ownership can be handed to a reader
+    (e.g. when the writer may exit first).
+    """
+
+    def __init__(
+        self, spec: RingSpec, create: bool = False, owner: bool | None = None
+    ) -> None:
+        self.spec = spec
+        self.owner = create if owner is None else owner
+        if create:
+            self._shm = shared_memory.SharedMemory(spec.name, True, spec.nbytes)
+        else:
+            self._shm = _attach(spec.name, track=self.owner)
+        buf = self._shm.buf
+        self._header = np.ndarray((_HEADER + 2 * spec.slots,), np.int64, buf)
+        self._locks = self._header[_HEADER::2]
+        self._tags = self._header[_HEADER + 1 :: 2]
+        self._slots = np.ndarray(
+            (spec.slots, *spec.shape),
+            spec.dtype,
+            buf,
+            offset=spec.header_bytes,
+        )
+        if create:
+            self._header[:] = 0
+        self.last_seq = 0  # of this reader
+        self.missed = 0  # items published but never read by this reader
+
+    @classmethod
+    def create(
+        cls, shape: tuple[int, ...], dtype: npt.DTypeLike, slots: int = 8
+    ) -> SharedRing:
+        """Create a new ring of `slots` arrays of `shape` and `dtype`."""
+        name = f"pyptc_{os.getpid()}_{time.monotonic_ns()}"
+        return cls(RingSpec(name, tuple(shape), np.dtype(dtype).str, slots), True)
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the latest published item (0 if none)."""
+        return int(self._header[0])
+
+    def publish(self, data: Any, tag: int = 0) -> int:
+        """Copy `data` into the next slot, and return its sequence number."""
+        seq = self.seq + 1
+        i = (seq - 1) % self.spec.slots
+        self._locks[i] = 2 * seq - 1
+        self._slots[i] = data
+        self._tags[i] = tag
+        self._locks[i] = 2 * seq
+        self._header[0] = seq
+        return seq
+
+    def valid(self, seq: int) -> bool:
+        """Whether item `seq` is still intact in its slot."""
+        return bool(self._locks[(seq - 1) % self.spec.slots] == 2 * seq)
+
+    def latest(self, copy: bool = True) -> tuple[int, int, np.ndarray] | None:
+        """Return (seq, tag, data) of the newest item, if newer than the last read.
+
+        With `copy=False`, `data` is a view into shared memory, which the writer
+        may overwrite at any time: check ``ring.valid(seq)`` after using it.
+        """
+        while True:
+            seq = self.seq
+            if seq <= self.last_seq:
+                return None
+            i = (seq - 1) % self.spec.slots
+            tag = int(self._tags[i])
+            data = self._slots[i]
+            if copy:
+                data = data.copy()
+            if self.valid(seq):
+                self.missed += seq - self.last_seq - 1
+                self.last_seq = seq
+                return seq, tag, data
+            # overwritten while reading: try again with the newer item
+
+    def close(self) -> None:
+        """Detach from the shared memory (and free it, if this is the `owner`)."""
+        del self._header, self._locks, self._tags, self._slots
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+
+def _attach(name: str, track: bool) -> shared_memory.SharedMemory:
+    if track:
+        return shared_memory.SharedMemory(name)
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    shm = shared_memory.SharedMemory(name)
+    # before 3.13, attaching registers the block with the resource tracker, which
+    # would unlink it (under the owner) when this process exits
+    from multiprocessing import resource_tracker
+
+    resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore
+    return shm
+
+
+def _publish_stats(ring: SharedRing, stat: Accumulator) -> None:
+    shape = ring.spec.shape[1:]
+    mean = np.broadcast_to(stat.mean(), shape)  # var is a scalar while len(stat) < 2
+    ring.publish((mean, np.broadcast_to(stat.var(), shape)), len(stat))
+
+
+def _acquire(
+    source: SnapSource,
+    n: int | None,
+    slots: int,
+    interval: float,
+    stat_type: Callable[[], Accumulator],
+    conn: Connection,
+    stop: Any,
+) -> None:
+    try:
+        snap = source()
+        img = snap()
+        stat = stat_type()
+        stat.push(img)
+    except BaseException as e:
+        conn.send(e)
+        return
+    frames = SharedRing.create(img.shape, img.dtype, slots)
+    # snapshots have the shape of the statistics, which is not necessarily the
+    # frame's (e.g. one value per region for a RegionStat)
+    stats = SharedRing.create((2, *np.shape(stat.mean())), np.float64, 2)
+    # the parent owns (and frees) the rings, as it may still read them after we exit
+    frames.owner = stats.owner = False
+    conn.send((frames.spec, stats.spec))
+    frames.publish(img, 0)
+    last = -np.inf
+    try:
+        while True:
+            if (now := time.perf_counter()) - last >= interval:
+                _publish_stats(stats, stat)
+                last = now
+            if (n is not None and len(stat) >= n) or stop.is_set():
+                break
+            img = snap()
+            frames.publish(img, len(stat))
+            stat.push(img)
+        _publish_stats(stats, stat)
+        stat.frozen = True
+        conn.send(stat)
+    except BaseException as e:
+        conn.send(e)
+    finally:
+        frames.close()
+        stats.close()
+
+
+class AcquisitionWorker:
+    """Acquire frames and accumulate statistics in a separate process.
+
+    Frames are published to the `frames` `SharedRing` as they are snapped, and
+    ``(mean, var)`` snapshots of the statistics (tagged with the number of frames)
+    to the `stats` ring every `interval` seconds, so readers in this process (e.g.
+    a GUI, see `poll`) never slow acquisition down.  Snapshots have the shape of
+    the accumulator's `mean` (``stats.spec.shape[1:]``): the frame shape for
+    per-pixel statistics, or e.g. one value per region for a `RegionStat`.
+
+    Parameters
+    ----------
+    source : SnapSource
+        Picklable callable returning a snap function, called in the worker (e.g. a
+        `CameraSource`, which creates the core in the worker).
+    n : int | None, optional
+        Number of frames to acquire, by default None (until `stop`).
+    slots : int, optional
+        Number of frames in the frame ring, by default 8
+    interval : float, optional
+        Seconds between statistics snapshots, by default 0.1
+    stat_type : Callable[[], Accumulator], optional
+        Factory for the accumulator (must be picklable), by default RunningStat.
+    """
+
+    def __init__(
+        self,
+        source: SnapSource,
+        n: int | None = None,
+        slots: int = 8,
+        interval: float = 0.1,
+        stat_type: Callable[[], Accumulator] = RunningStat,
+    ) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child = ctx.Pipe(duplex=False)
+        self._stop = ctx.Event()
+        self._process = ctx.Process(
+            target=_acquire,
+            args=(source, n, slots, interval, stat_type, child, self._stop),
+            daemon=True,
+        )
+        self._child = child
+        self.frames: SharedRing | None = None
+        self.stats: SharedRing | None = None
+        self._result: Any = None
+
+    def start(self, timeout: float | None = 30) -> None:
+        """Start the worker, and attach to its rings once it has snapped a frame."""
+        self._process.start()
+        self._child.close()
+        if not self._conn.poll(timeout):
+            self._process.kill()
+            raise RuntimeError("Acquisition worker did not start")
+        msg = self._conn.recv()
+        if isinstance(msg, BaseException):
+            raise msg
+        self.frames, self.stats = (SharedRing(spec, owner=True) for spec in msg)
+
+    def stop(self) -> None:
+        """Ask the worker to stop after the current frame."""
+        self._stop.set()
+
+    def is_alive(self) -> bool:
+        return self._process.is_alive()
+
+    def result(self, timeout: float | None = None) -> Accumulator:
+        """Wait for the worker to finish, and return its (frozen) accumulator."""
+        if self._result is None:
+            if not self._conn.poll(timeout):
+                raise TimeoutError("Acquisition worker is still running")
+            self._result = self._conn.recv()
+            self._process.join()
+        if isinstance(self._result, BaseException):
+            raise self._result
+        return self._result  # type: ignore [no-any-return]
+
+    def close(self) -> None:
+        """Stop the worker and detach from its rings.
+
+        The worker's accumulator is still received (for `result`), since the
+        worker cannot exit before it has been read.
+        """
+        self.stop()
+        deadline = time.monotonic() + 5
+        if self._result is None and self._process.is_alive():
+            try:
+                if self._conn.poll(5):
+                    self._result = self._conn.recv()
+            except EOFError:  # the worker died without sending it
+                pass
+        self._process.join(max(0, deadline - time.monotonic()))
+        if self._process.is_alive():
+            self._process.kill()
+        for ring in (self.frames, self.stats):
+            if ring is not None:
+                ring.close()
+        self.frames = self.stats = None
+
+    def __enter__(self) -> AcquisitionWorker:
+        self.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+def poll(
+    ring: SharedRing,
+    callback: Callable[[int, int, np.ndarray], Any],
+    max_fps: float = 30,
+    parent: QObject | None = None,
+) -> QTimer:
+    """Call `callback(seq, tag, data)` on the GUI thread for new items in `ring`.
+
+    The ring is checked at most `max_fps` times a second (or whenever the event
+    loop is idle if `max_fps` is 0), and only the newest item is read
+    (intermediate items are counted in ``ring.missed``), so a slow GUI never holds
+    up the writer.  `data` is the reader's own copy.  Returns the (started)
+    QTimer; stop it to unsubscribe.
+    """
+    from qtpy.QtCore import QTimer
+
+    def _poll() -> None:
+        if (item := ring.latest()) is not None:
+            callback(*item)
+
+    timer = QTimer(parent)
+    timer.timeout.connect(_poll)
+    timer.start(int(1000 / max_fps) if max_fps else 0)
+    return timer
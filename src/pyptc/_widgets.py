@@ -3,7 +3,9 @@ import warnings
 
 from pymmcore_plus import CMMCorePlus, Device
 from pymmcore_widgets import LiveButton, SnapButton, ExposureWidget, ChannelWidget
+from qtpy.QtCore import Qt
 from qtpy.QtWidgets import (
+    QApplication,
     QComboBox,
     QHBoxLayout,
     QLabel,
@@ -32,7 +34,10 @@ class CameraSelector(QWidget):
 
         self._reload_button = QPushButton("")
         self._reload_button.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-        self._reload_button.clicked.connect(self._reload_cameras)
+        self._reload_button.setToolTip(
+            "Reload cameras (Shift+click to probe all adapters again)"
+        )
+        self._reload_button.clicked.connect(self._on_reload_clicked)
         setTextIcon(self._reload_button, MDI6.refresh, 22)
 
         self.setLayout(QHBoxLayout())
@@ -41,11 +46,15 @@ class CameraSelector(QWidget):
         self.layout().addWidget(self._combo)
         self.layout().addWidget(self._reload_button)
 
-    def _reload_cameras(self) -> None:
+    def _on_reload_clicked(self) -> None:
+        shift = QApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier
+        self._reload_cameras(refresh=bool(shift))
+
+    def _reload_cameras(self, refresh: bool = False) -> None:
         from ._core_utils import load_all_cameras
 
         self._combo.clear()
-        for device in load_all_cameras(self._mmc):
+        for device in load_all_cameras(self._mmc, refresh=refresh):
             self._combo.addItem(device.label, device)
 
     def _set_camera(self, index: int) -> None:
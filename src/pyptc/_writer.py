@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import bz2
+import io
+import json
+import lzma
+import os
+import queue
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+
+CODECS: dict[str, Any] = {"zlib": zlib, "bz2": bz2, "lzma": lzma}
+# name of each codec's `compress` argument for the compression level
+_LEVEL_ARG = {"zlib": "level", "bz2": "compresslevel", "lzma": "preset"}
+_STOP = object()
+
+
+class FrameWriter:
+    """Write raw frames to a chunked on-disk store, from a background thread.
+
+    Frames passed to `put` are queued and written by a worker thread in chunks of
+    `chunk_size` frames, one ``.npy`` file per chunk (optionally compressed), so
+    that saving frames doesn't stall acquisition.  The store in `path` looks like::
+
+        path/
+            meta.json          # shape, dtype, chunk_size, compression, count
+            chunks/000000.npy  # or 000000.npy.zlib, etc... when compressed
+
+    ``meta.json`` is written when the writer opens and updated after each chunk,
+    so the chunks written so far can be read back even if the process dies before
+    `close`.  Use `read_frames` to read it back.
+
+    Parameters
+    ----------
+    path : str | Path
+        Directory to write to.  Will be created if necessary.
+    chunk_size : int, optional
+        Number of frames per chunk file, by default 32
+    compression : str | None, optional
+        One of "zlib", "bz2" or "lzma", by default None (uncompressed).
+    level : int | None, optional
+        Compression level, by default the codec's default.
+    queue_size : int, optional
+        Maximum number of frames waiting to be written, by default 64.  When the
+        queue is full, `put` blocks (or drops the frame, if `block=False`).
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        chunk_size: int = 32,
+        compression: str | None = None,
+        level: int | None = None,
+        queue_size: int = 64,
+    ) -> None:
+        if compression is not None and compression not in CODECS:
+            raise ValueError(
+                f"compression must be one of {set(CODECS)} or None, not "
+                f"{compression!r}"
+            )
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self.compression = compression
+        self.level = level
+        self._compress_kwargs: dict[str, int] = {}
+        if compression is not None and level is not None:
+            self._compress_kwargs = {_LEVEL_ARG[compression]: level}
+            try:  # fail here, rather than in the writer thread
+                CODECS[compression].compress(b"", **self._compress_kwargs)
+            except (ValueError, lzma.LZMAError, zlib.error) as e:
+                raise ValueError(f"Invalid {compression} level {level!r}") from e
+
+        self.frames_written = 0
+        self.bytes_written = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self._t0: float | None = None
+        self._t1: float | None = None
+        self._chunk: np.ndarray | None = None
+        self._chunk_len = 0
+        self._n_chunks = 0
+        self._error: BaseException | None = None
+
+        (self.path / "chunks").mkdir(parents=True, exist_ok=True)
+        self._write_meta()
+        self._queue: queue.Queue = queue.Queue(queue_size)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def put(
+        self, frame: np.ndarray, block: bool = True, timeout: float | None = None
+    ) -> bool:
+        """Queue `frame` (a copy of it) for writing.
+
+        Returns False if the frame was dropped because the queue was full.
+        """
+        if self._error is not None:
+            raise self._error
+        if self._t0 is None:
+            self._t0 = time.perf_counter()
+        try:
+            self._queue.put(np.array(frame), block, timeout)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    @property
+    def depth(self) -> int:
+        """Number of frames waiting to be written."""
+        return self._queue.qsize()
+
+    def stats(self) -> dict[str, float]:
+        """Return throughput (frames/s, MB/s) and queue depth statistics."""
+        elapsed = 0.0
+        if self._t0 is not None:
+            elapsed = (self._t1 or time.perf_counter()) - self._t0
+        return {
+            "frames": self.frames_written,
+            "dropped": self.dropped,
+            "MB": self.bytes_written / 1e6,
+            "elapsed": elapsed,
+            "fps": self.frames_written / elapsed if elapsed else 0.0,
+            "MB/s": self.bytes_written / 1e6 / elapsed if elapsed else 0.0,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+        }
+
+    def close(self) -> None:
+        """Write any remaining frames and wait for the writer thread to finish."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> FrameWriter:
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        try:
+            while (frame := self._queue.get()) is not _STOP:
+                if self._chunk is None:
+                    self._chunk = np.empty((self.chunk_size, *frame.shape), frame.dtype)
+                self._chunk[self._chunk_len] = frame
+                self._chunk_len += 1
+                if self._chunk_len == self.chunk_size:
+                    self._write_chunk()
+            self._write_chunk()
+        except BaseException as e:
+            self._error = e
+            # unblock any producer waiting on a full queue
+            while not self._queue.empty():
+                self._queue.get_nowait()
+        self._t1 = time.perf_counter()
+
+    def _write_chunk(self) -> None:
+        if not self._chunk_len:
+            return
+        data = self._chunk[: self._chunk_len]  # type: ignore [index]
+        name = self.path / "chunks" / f"{self._n_chunks:06d}.npy"
+        if self.compression is None:
+            with open(name, "wb") as f:
+                np.lib.format.write_array(f, data)
+                nbytes = f.tell()
+        else:
+            buf = io.BytesIO()
+            np.lib.format.write_array(buf, data)
+            codec = CODECS[self.compression]
+            encoded = codec.compress(buf.getbuffer(), **self._compress_kwargs)
+            name.with_suffix(f".npy.{self.compression}").write_bytes(encoded)
+            nbytes = len(encoded)
+        self.frames_written += self._chunk_len
+        self.bytes_written += nbytes
+        self._n_chunks += 1
+        self._chunk_len = 0
+        self._write_meta()
+
+    def _write_meta(self) -> None:
+        chunk = self._chunk
+        meta = {
+            "shape": (
+                [self.frames_written, *chunk.shape[1:]] if chunk is not None else [0]
+            ),
+            "dtype": chunk.dtype.str if chunk is not None else None,
+            "chunk_size": self.chunk_size,
+            "compression": self.compression,
+            "count": self.frames_written,
+        }
+        tmp = self.path / "meta.tmp.json"
+        tmp.write_text(json.dumps(meta, indent=2))
+        os.replace(tmp, self.path / "meta.json")
+
+
+def iter_chunks(path: str | Path) -> Iterator[np.ndarray]:
+    """Yield the (N, *frame_shape) chunks of a store written by FrameWriter."""
+    path = Path(path)
+    compression = json.loads((path / "meta.json").read_text())["compression"]
+    suffix = ".npy" if compression is None else f".npy.{compression}"
+    for file in sorted((path / "chunks").glob(f"*{suffix}")):
+        if compression is None:
+            yield np.load(file)
+        else:
+            data = CODECS[compression].decompress(file.read_bytes())
+            yield np.load(io.BytesIO(data))
+
+
+def read_frames(path: str | Path) -> np.ndarray:
+    """Read all frames from a store written by FrameWriter into one array."""
+    chunks = list(iter_chunks(path))
+    if not chunks:  # nothing written yet
+        meta = json.loads((Path(path) / "meta.json").read_text())
+        return np.empty(meta["shape"], meta["dtype"])
+    return np.concatenate(chunks)
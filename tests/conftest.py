@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+
+class SimCamera:
+    """Simulated camera: 2 e-/DN, 100 DN offset, 4 e- read noise, clips at 4095."""
+
+    def __init__(self, flux=500.0, shape=(32, 32)):
+        self.rng = np.random.default_rng(1)
+        self.flux = flux  # e-/ms
+        self.shape = shape
+        self.exposure = 0.0
+
+    def setExposure(self, exposure):
+        self.exposure = exposure
+
+    def getCameraDevice(self):
+        return "Camera"
+
+    def waitForDevice(self, label):
+        pass
+
+    def snap(self):
+        e = self.rng.poisson(self.flux * self.exposure, self.shape)
+        e = e + self.rng.normal(0, 4, self.shape)
+        return np.clip(100 + e / 2, 0, 4095).astype(np.uint16)
+
+
+class PoissonSource:
+    """Picklable frame source factory, for cameras run in other processes."""
+
+    def __init__(self, lam=100, shape=(16, 16)):
+        self.lam = lam
+        self.shape = shape
+
+    def __call__(self):
+        rng = np.random.default_rng(0)
+        return lambda: rng.poisson(self.lam, self.shape).astype(np.uint16)
+
+
+@pytest.fixture
+def stack():
+    rng = np.random.default_rng(0)
+    return rng.poisson(100, size=(20, 32, 48)).astype(np.uint16)
+
+
+@pytest.fixture
+def qapp():
+    qtwidgets = pytest.importorskip("qtpy.QtWidgets")
+    return qtwidgets.QApplication.instance() or qtwidgets.QApplication([])
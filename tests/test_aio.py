@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from pyptc._aio import acollect_stats, stream_stats
+
+
+class Camera:
+    def __init__(self, delay=0.002):
+        self.delay = delay
+        self.snaps = 0
+        self.rng = np.random.default_rng(0)
+
+    def snap(self):
+        time.sleep(self.delay)
+        self.snaps += 1
+        return self.rng.poisson(100, (16, 16)).astype(np.uint16)
+
+
+def test_acollect_stats_concurrent():
+    async def main():
+        cams = [Camera(), Camera()]
+        return await asyncio.gather(*(acollect_stats(c.snap, 20) for c in cams))
+
+    stats = asyncio.run(main())
+    assert [len(s) for s in stats] == [20, 20]
+    assert all(s.frozen for s in stats)
+
+
+def test_stream_stats():
+    async def main():
+        return [s async for s in stream_stats(Camera().snap, 50, interval=0.01)]
+
+    snapshots = asyncio.run(main())
+    assert 1 < len(snapshots) <= 50
+    assert snapshots[-1].done and snapshots[-1].n == 50
+    assert not any(s.done for s in snapshots[:-1])
+    assert [s.n for s in snapshots] == sorted(s.n for s in snapshots)
+    assert np.mean(snapshots[-1].mean) == pytest.approx(100, rel=0.05)
+    with pytest.raises(ValueError):
+        snapshots[0].mean[0, 0] = 0
+
+
+def test_stream_stats_cancel():
+    cam = Camera()
+
+    async def main():
+        async for snapshot in stream_stats(cam.snap, 1000, interval=0):
+            if snapshot.n >= 5:
+                break
+        await asyncio.sleep(0.05)
+        return cam.snaps
+
+    assert asyncio.run(main()) < 1000
+    snaps = cam.snaps
+    time.sleep(0.05)
+    assert cam.snaps == snaps  # acquisition stopped
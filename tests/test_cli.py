@@ -0,0 +1,69 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+from conftest import SimCamera
+from pyptc import _cli
+
+
+def test_run_batch(tmp_path):
+    out = io.StringIO()
+    exposures = [0, 1, 2, 4, 8]
+    result = _cli.run_batch(
+        SimCamera(), exposures, n_frames=20, output=tmp_path, meta={"a": 1}, file=out
+    )
+    lines = out.getvalue().splitlines()
+    assert lines[0].startswith("[1/5] exposure 0 ms: 20 frames")
+    assert len([x for x in lines if x.startswith("[")]) == len(exposures)
+
+    info = json.loads((tmp_path / "ptc.json").read_text())
+    assert info["a"] == 1 and info["exposures"] == exposures
+    assert info["fit"]["conversion_gain"] == pytest.approx(2, rel=0.15)
+    with np.load(tmp_path / "ptc.npz") as data:
+        np.testing.assert_allclose(data["signal"], result.signal)
+        assert "read_noise" in data
+
+
+def test_main(tmp_path, monkeypatch, capsys):
+    pytest.importorskip("pymmcore_plus")
+    monkeypatch.setattr(_cli, "_make_core", lambda config: SimCamera())
+    argv = ["--sweep", "1", "8", "4", "-n", "10", "--tile", "16", "-o", str(tmp_path)]
+    assert _cli.main(argv) == 0
+    assert "characterizing camera 'Camera'" in capsys.readouterr().out
+    info = json.loads((tmp_path / "Camera" / "ptc.json").read_text())
+    assert info["stat"] == "region"
+    assert info["exposures"] == [0, 1, 2, 4, 8]  # a dark point is added
+    assert np.shape(info["signal"]) == (5, 2, 2)
+
+
+def test_main_camera_failure(tmp_path, monkeypatch, capsys):
+    pytest.importorskip("pymmcore_plus")
+
+    def select_camera(core, name, isolate=False):
+        if name == "missing":
+            raise RuntimeError("no such camera")
+        return name
+
+    def run_batch(core, exposures, *args):
+        if args[-1]["camera"] == "broken":
+            raise OSError("camera disconnected")
+        return original(core, exposures, *args, file=io.StringIO())
+
+    original = _cli.run_batch
+    monkeypatch.setattr(_cli, "_make_core", lambda config: SimCamera())
+    monkeypatch.setattr(_cli, "select_camera", select_camera)
+    monkeypatch.setattr(_cli, "run_batch", run_batch)
+    cameras = ["-c", "broken", "-c", "missing", "-c", "Camera"]
+    argv = [*cameras, "-e", "0", "1", "2", "-n", "4", "-o", str(tmp_path)]
+    assert _cli.main(argv) == 1
+
+    err = capsys.readouterr().err
+    assert "camera disconnected" in err and "no such camera" in err
+    assert (tmp_path / "Camera" / "ptc.json").exists()  # ran after the failures
+    failures = json.loads((tmp_path / "failures.json").read_text())
+    assert failures == {
+        "broken": "OSError: camera disconnected",
+        "missing": "RuntimeError: no such camera",
+    }
@@ -0,0 +1,112 @@
+import pytest
+
+pytest.importorskip("pymmcore_plus")
+
+from pyptc import _core_utils  # noqa: E402
+from pyptc._core_utils import (  # noqa: E402
+    AdapterCatalog,
+    DeviceAdapter,
+    probe_adapters,
+)
+
+
+class FakeCore:
+    def __init__(self, folder):
+        self.folder = folder
+        self.probes = []
+
+    def getDeviceAdapterSearchPaths(self):
+        return [str(self.folder)]
+
+    def getAvailableDevices(self, adapter):
+        self.probes.append(adapter)
+        if adapter == "Broken":
+            raise RuntimeError("Failed to load device adapter")
+        return ["DCam", "DStage"]
+
+    def getAvailableDeviceTypes(self, adapter):
+        return [2, 5]
+
+
+def test_adapter_catalog(tmp_path):
+    lib = tmp_path / "libmmgr_dal_Demo.so.0"
+    lib.write_bytes(b"v1")
+    (tmp_path / "libmmgr_dal_Broken.so.0").write_bytes(b"")
+    cache = tmp_path / "cache" / "catalog.json"
+
+    core = FakeCore(tmp_path)
+    catalog = AdapterCatalog(core, cache)
+    assert catalog.devices("Demo") == [("DCam", 2), ("DStage", 5)]
+    with pytest.raises(RuntimeError):
+        catalog.devices("Broken")
+    catalog.save()
+    assert core.probes == ["Demo", "Broken"]
+
+    # warm start: a file read, no probing, except for the failure (which is not
+    # saved, e.g. its vendor SDK may have been installed since)
+    core.probes.clear()
+    catalog = AdapterCatalog(core, cache)
+    adapter = DeviceAdapter("Demo", core, catalog)
+    assert [d.device for d in adapter.iterAvailableDevices(2)] == ["DCam"]
+    assert not DeviceAdapter("Broken", core, catalog).works
+    assert not DeviceAdapter("Broken", core, catalog).works
+    assert core.probes == ["Broken"]
+
+    # nothing changed: the file isn't written again
+    cache.write_text(cache.read_text())  # same contents, new mtime
+    mtime = cache.stat().st_mtime_ns
+    catalog.save()
+    assert cache.stat().st_mtime_ns == mtime
+
+    # a sibling adapter changed: Demo isn't probed again
+    core.probes.clear()
+    (tmp_path / "libmmgr_dal_Demo-old.so.0").write_bytes(b"")
+    assert catalog.devices("Demo") == [("DCam", 2), ("DStage", 5)]
+    assert core.probes == []
+
+    # the adapter changed: only it is probed again
+    lib.write_bytes(b"v2, a bit bigger")
+    assert catalog.devices("Demo") == [("DCam", 2), ("DStage", 5)]
+    assert core.probes == ["Demo"]
+
+
+def test_adapter_catalog_camera_failures(tmp_path, monkeypatch):
+    for name in ("Good", "Bad"):
+        (tmp_path / f"libmmgr_dal_{name}.so.0").write_bytes(b"")
+    cache = tmp_path / "catalog.json"
+    probed = []
+
+    def fake_probe(names, *args):
+        for name in names:
+            probed.append(name)
+            error = "failed to initialize" if name == "Bad" else None
+            yield name, {"devices": [["Cam", 2]], "cameras": {"Cam": error}}
+
+    monkeypatch.setattr(_core_utils, "probe_adapters", fake_probe)
+    core = FakeCore(tmp_path)
+    catalog = AdapterCatalog(core, cache)
+    catalog.refresh(["Good", "Bad"])
+    assert catalog.camera_works("Good", "Cam")
+    assert not catalog.camera_works("Bad", "Cam")
+    catalog.save()
+
+    # the failed load test is not saved, and is retried by the next refresh
+    probed.clear()
+    catalog = AdapterCatalog(core, cache)
+    assert catalog.camera_works("Bad", "Cam")
+    assert catalog.devices("Bad") == [("Cam", 2)]
+    catalog.refresh(["Good", "Bad"])
+    assert probed == ["Bad"]
+
+
+def test_probe_adapters_isolated():
+    # a missing adapter fails inside the worker, not in this process
+    results = dict(probe_adapters(["NotAnAdapter"], [], timeout=30))
+    assert "error" in results["NotAnAdapter"]
+    assert "timed out" not in results["NotAnAdapter"]["error"]
+
+
+def test_probe_adapters_timeout():
+    results = dict(probe_adapters(["A", "B"], [], timeout=0, max_workers=1))
+    assert set(results) == {"A", "B"}
+    assert all("timed out" in r["error"] for r in results.values())
@@ -0,0 +1,75 @@
+import numpy as np
+
+from pyptc._defects import DEAD, HOT, NOISY, WARM, DefectDetector, tile_median_mad
+from pyptc._ptc import RunningStat
+
+
+def test_tile_median_mad():
+    img = np.arange(64.0).reshape(8, 8)
+    med, mad = tile_median_mad(img, (4, 4))
+    assert med.shape == mad.shape == (2, 2)
+    np.testing.assert_allclose(med, np.median(img.reshape(2, 4, 2, 4), axis=(1, 3)))
+
+    # a stride that doesn't divide the tile
+    img = np.arange(100.0 * 130).reshape(100, 130)
+    med, mad = tile_median_mad(img, (64, 64), stride=3)
+    assert med.shape == (1, 2)
+    np.testing.assert_allclose(med[0, 1], np.median(img[:64:3, 64:128:3]))
+
+
+def test_defect_detector():
+    rng = np.random.default_rng(0)
+    stat = RunningStat()
+    detector = DefectDetector(tile=(32, 32), confirm=2)
+    for i in range(20):
+        frame = rng.normal(100, 5, (100, 100))
+        frame[5, 7] += 500  # hot
+        frame[50, 60] += 8  # warm
+        frame[70, 20] = 0  # dead
+        frame[90, 95] += 30 * (-1) ** i  # noisy
+        stat.push(frame)
+        if i > 2:
+            defects = detector.update(stat)
+
+    found = {(d["row"], d["col"]): d["kind"] for d in defects}
+    assert found == {(5, 7): HOT, (50, 60): WARM, (70, 20): DEAD, (90, 95): NOISY}
+
+
+def test_defect_detector_stride():
+    rng = np.random.default_rng(0)
+    stat = RunningStat()
+    frames = rng.normal(100, 5, (10, 128, 128))
+    frames[:, 5, 7] += 500
+    stat.push_many(frames)
+    defects = DefectDetector(stride=3, confirm=1).update(stat)
+    assert {(d["row"], d["col"]): d["kind"] for d in defects} == {(5, 7): HOT}
+
+
+def test_defect_detector_confirm():
+    rng = np.random.default_rng(0)
+    frames = rng.normal(100, 5, (10, 16, 16))
+    clean = RunningStat()
+    clean.push_many(frames)
+    frames[:, 3, 3] = 200
+    stat = RunningStat()
+    stat.push_many(frames)
+    detector = DefectDetector(tile=(8, 8), stride=1, confirm=3)
+    assert len(detector.update(stat)) == 0
+    assert len(detector.update(stat)) == 0
+    assert len(detector.update(stat)) == 1
+    assert len(detector.update(clean)) == 0  # no longer a defect
+
+
+def test_defect_detector_early_and_flat():
+    detector = DefectDetector(tile=(8, 8), stride=1, confirm=1)
+    stat = RunningStat()
+    assert len(detector.update(stat)) == 0
+    frame = np.full((16, 16), 100, np.uint16)
+    frame[::2, ::3] += 1  # one DN of quantization noise isn't a defect
+    frame[4, 5] = 150
+    stat.push(frame)
+    assert len(detector.update(stat)) == 0  # a single frame has no variance map
+    assert detector.updates == 0
+    stat.push(frame)
+    defects = detector.update(stat)
+    assert {(d["row"], d["col"]): d["kind"] for d in defects} == {(4, 5): HOT}
@@ -0,0 +1,76 @@
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("vispy")
+pytest.importorskip("qtpy")
+
+from pyptc._histogram import Histogram, _HistogramWorker, calc_histogram  # noqa: E402
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16])
+@pytest.mark.parametrize("bins", [7, 100, 256])
+def test_calc_histogram_integer(dtype, bins):
+    rng = np.random.default_rng(0)
+    data = rng.poisson(60, size=(64, 48)).astype(dtype)
+    counts, edges = calc_histogram(data, bins)
+    expected_counts, expected_edges = np.histogram(data, bins)
+    np.testing.assert_array_equal(counts, expected_counts)
+    np.testing.assert_allclose(edges, expected_edges)
+
+
+def test_calc_histogram_constant_and_float():
+    data = np.full((8, 8), 5, np.uint16)
+    for result, expected in zip(calc_histogram(data, 10), np.histogram(data, 10)):
+        np.testing.assert_allclose(result, expected)
+
+    data = np.random.default_rng(0).normal(size=(32, 32))
+    for result, expected in zip(calc_histogram(data, 10), np.histogram(data, 10)):
+        np.testing.assert_allclose(result, expected)
+
+
+def test_calc_histogram_stride():
+    data = np.arange(100, dtype=np.uint16).reshape(10, 10)
+    counts, _ = calc_histogram(data, 5, stride=2)
+    assert counts.sum() == 25
+
+
+def _process_events_until(qapp, condition, timeout=5):
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        qapp.processEvents()
+        time.sleep(0.001)
+
+
+def test_histogram_worker(qapp):
+    worker = _HistogramWorker(bins=10, max_fps=20)
+    results = []
+    worker.ready.connect(lambda: results.append(worker.take()))
+    frames = np.random.default_rng(0).poisson(100, (50, 32, 32)).astype(np.uint16)
+    for frame in frames:
+        worker.submit(frame)
+    _process_events_until(qapp, lambda: results and worker._pending is None)
+    worker.close()
+    assert not worker._thread.is_alive()
+
+    # frames submitted faster than max_fps are coalesced, the newest one wins
+    assert len(results) < 5
+    assert worker.skipped >= len(frames) - 5
+    for result, expected in zip(results[-1], np.histogram(frames[-1], 10)):
+        np.testing.assert_allclose(result, expected)
+
+
+def test_histogram_widget_stops_worker(qapp):
+    widget = Histogram(np.zeros((4, 4), np.uint16), bins=10)
+    worker = widget._worker
+    assert worker is not None and worker._thread.is_alive()
+
+    # the display is updated when the worker signals a result
+    def counts():
+        return widget._hist._meshdata.get_vertices()[:, 1].max()
+
+    _process_events_until(qapp, lambda: counts() == 16)
+    assert counts() == 16
+    widget.close()
+    assert not worker._thread.is_alive()
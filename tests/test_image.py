@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("vispy")
+pytest.importorskip("qtpy")
+
+from pyptc._image import CLIM_BINS, Image, calc_clims  # noqa: E402
+from pyptc._ptc import RunningStat  # noqa: E402
+
+
+@pytest.mark.parametrize("dtype", [np.uint16, np.float32])
+def test_calc_clims(dtype):
+    img = np.random.default_rng(0).poisson(100, size=(256, 256)).astype(dtype)
+    assert calc_clims(img) == (img.min(), img.max())
+
+    img[10, 10] = 4000  # a hot pixel doesn't affect percentile limits
+    lo, hi = calc_clims(img, (1, 99), stride=2)
+    expected = np.percentile(img[::2, ::2], (1, 99))
+    assert lo == pytest.approx(expected[0], abs=1)
+    assert hi == pytest.approx(expected[1], abs=1)
+    assert hi < 200
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_calc_clims_float(dtype):
+    # timed against np.percentile in benchmarks/bench.py (--only autoscale percentile)
+    img = np.random.default_rng(0).normal(100, 10, size=(2048, 2048)).astype(dtype)
+    sub = img[::4, ::4]
+    bin_width = (sub.max() - sub.min()) / CLIM_BINS
+    lo, hi = calc_clims(img, (0.1, 99.9), stride=4)
+    expected = np.percentile(sub, (0.1, 99.9))
+    assert lo <= expected[0] <= lo + bin_width
+    assert hi - bin_width <= expected[1] <= hi
+
+
+def test_render_scheduler_coalesces(qapp):
+    image = Image()
+    frames = np.random.default_rng(0).poisson(100, (10, 16, 16)).astype(np.float32)
+    for frame in frames:
+        image.post((0, 0), frame)
+    image.post((1, 0), frames[0])
+    assert image.scheduler.skipped == len(frames) - 1
+
+    image.scheduler.flush()
+    assert image.scheduler.drawn == 2
+    np.testing.assert_array_equal(image[0, 0].image._data, frames[-1])
+    np.testing.assert_array_equal(image[1, 0].image._data, frames[0])
+
+
+def test_stats_callback_snapshot(qapp):
+    image = Image()
+    callback = image.stats_callback()
+    frames = np.random.default_rng(0).poisson(100, (10, 16, 16)).astype(np.float32)
+    stat = RunningStat()
+    for frame in frames[:5]:
+        stat.push(frame)
+    callback(frames[4], stat)
+    expected = frames[:5].mean(0), frames[:5].var(0, ddof=1)
+
+    # later pushes (and throttled callbacks) don't change the posted snapshot
+    for frame in frames[5:]:
+        stat.push(frame)
+        callback(frame, stat)
+    image.scheduler.flush()
+    np.testing.assert_allclose(image[0, 0].image._data, expected[0], rtol=1e-6)
+    np.testing.assert_allclose(image[1, 0].image._data, expected[1], rtol=1e-5)
+
+
+@pytest.mark.parametrize("max_fps", [0, 1])
+def test_stats_callback_counts_skipped(qapp, max_fps):
+    image = Image(max_fps=max_fps)
+    callback = image.stats_callback()
+    frames = np.random.default_rng(0).poisson(100, (10, 16, 16)).astype(np.float32)
+    stat = RunningStat()
+    stat.push(frames[0])
+    for frame in frames[1:]:
+        stat.push(frame)
+        callback(frame, stat)
+    # throttled (max_fps=1) or replaced before drawing (max_fps=0): all but the
+    # first mean and variance are skipped
+    assert image.scheduler.skipped == 2 * 8
+    image.scheduler.flush()
+    assert image.scheduler.drawn == 2
+    with pytest.raises(ValueError):
+        image.scheduler.max_fps = -1
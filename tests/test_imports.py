@@ -0,0 +1,35 @@
+import json
+import subprocess
+import sys
+
+# generous, so that a slow CI machine doesn't fail; a regression that pulls in Qt
+# or vispy typically costs far more than this
+BUDGET = 0.5
+HEAVY = ("qtpy", "PySide6", "PyQt5", "PyQt6", "vispy", "pymmcore_plus", "loguru")
+
+SCRIPT = """
+import json, sys, time
+t0 = time.perf_counter()
+import pyptc, pyptc._ptc, pyptc._core_utils, pyptc._sequence, pyptc._writer
+elapsed = time.perf_counter() - t0
+pyptc.RunningStat, pyptc.collect_stats, pyptc.AdapterCatalog
+print(json.dumps({"elapsed": elapsed, "modules": list(sys.modules)}))
+"""
+
+
+def test_headless_import():
+    out = subprocess.run(
+        [sys.executable, "-c", SCRIPT], capture_output=True, text=True, check=True
+    )
+    result = json.loads(out.stdout)
+    heavy = [m for m in result["modules"] if m.split(".")[0] in HEAVY]
+    assert not heavy, f"importing pyptc's core imported {heavy}"
+    assert result["elapsed"] < BUDGET
+
+
+def test_lazy_exports():
+    import pyptc
+    from pyptc._ptc import RunningStat
+
+    assert pyptc.RunningStat is RunningStat
+    assert "RunningStat" in dir(pyptc)
@@ -0,0 +1,135 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from conftest import PoissonSource
+from pyptc import _core_utils
+from pyptc._multi import CameraSource, collect_cameras, collect_multicamera_stats
+from pyptc._ptc import PairDiffStat
+
+
+@pytest.mark.parametrize("executor", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_collect_cameras(executor):
+    sources = {"a": PoissonSource(10), "b": PoissonSource(1000)}
+    with executor(2) as pool:
+        runs = collect_cameras(sources, 20, PairDiffStat, pool, timings=True)
+    assert set(runs) == {"a", "b"}
+    for name, lam in (("a", 10), ("b", 1000)):
+        run = runs[name]
+        assert run.frames == 20 and run.dropped == 0
+        assert run.frame_bytes == 16 * 16 * 2
+        assert run.fps > 0 and run.mb_per_s > 0
+        assert np.mean(run.stat.var()) == pytest.approx(lam, rel=0.2)
+        assert run.stat.timings.count == 20
+
+
+class FakeCameraCore:
+    """Stand-in for the core created by `CameraSource.core`."""
+
+    deliver = None  # frames that a sequence acquisition delivers (default: all)
+
+    def __init__(self, adapter_paths=()):
+        self.adapter_paths = adapter_paths
+        self.rng = np.random.default_rng(0)
+        self.devices = {}
+        self.properties = {}
+        self._buffer = []
+
+    def loadDevice(self, label, adapter, device):
+        self.devices[label] = (adapter, device)
+
+    def initializeDevice(self, label):
+        assert label in self.devices
+
+    def setCameraDevice(self, label):
+        self.camera = label
+
+    def setProperty(self, label, prop, value):
+        self.properties[prop] = value
+
+    def snap(self):
+        lam = float(self.properties.get("Level", 100))
+        return self.rng.poisson(lam, (8, 8)).astype(np.uint16)
+
+    def startSequenceAcquisition(self, n, interval, stop_on_overflow):
+        self._buffer = [self.snap() for _ in range(min(n, self.deliver or n))]
+
+    def getRemainingImageCount(self):
+        return len(self._buffer)
+
+    def isSequenceRunning(self):
+        return bool(self._buffer)
+
+    def popNextImage(self):
+        return self._buffer.pop(0)
+
+    def stopSequenceAcquisition(self):
+        pass
+
+
+@pytest.mark.parametrize("sequence", [0, 32])
+def test_collect_cameras_fake_core(monkeypatch, sequence):
+    monkeypatch.setattr(_core_utils, "_core_class", lambda: FakeCameraCore)
+    monkeypatch.setattr(FakeCameraCore, "deliver", 15)
+    sources = {
+        "a": CameraSource("Adapter", "A", {"Level": "10"}, ("/mm",)),
+        "b": CameraSource("Adapter", "B", {"Level": "1000"}, ("/mm",)),
+    }
+    core = sources["a"].core()
+    assert core.adapter_paths == ("/mm",)
+    assert core.devices == {"Camera": ("Adapter", "A")} and core.camera == "Camera"
+
+    with ThreadPoolExecutor(2) as pool:
+        runs = collect_cameras(sources, 20, PairDiffStat, pool, sequence=sequence)
+    for name, lam in (("a", 10), ("b", 1000)):
+        run = runs[name]
+        assert run.frame_bytes == 8 * 8 * 2
+        # only a sequence acquisition can lose frames
+        assert (run.frames, run.dropped) == ((15, 5) if sequence else (20, 0))
+        assert np.mean(run.stat.mean()) == pytest.approx(lam, rel=0.1)
+
+    with pytest.raises(ValueError, match="timings"):
+        collect_cameras(sources, 20, timings=True, sequence=32)
+    with ThreadPoolExecutor(1) as pool, pytest.raises(TypeError, match="core"):
+        collect_cameras({"p": PoissonSource()}, 20, executor=pool, sequence=32)
+
+
+class MultiCameraCore:
+    def __init__(self, n_channels=3):
+        self.n_channels = n_channels
+        self.rng = np.random.default_rng(0)
+
+    def getNumberOfCameraChannels(self):
+        return self.n_channels
+
+    def getCameraChannelName(self, i):
+        return f"Camera{i}"
+
+    def snapImage(self):
+        self.images = [
+            self.rng.poisson(100 * (i + 1), (8, 8)) for i in range(self.n_channels)
+        ]
+
+    def getImage(self, i):
+        return self.images[i]
+
+
+def test_collect_multicamera_stats():
+    runs = collect_multicamera_stats(MultiCameraCore(), 30)
+    assert list(runs) == ["Camera0", "Camera1", "Camera2"]
+    for i, run in enumerate(runs.values()):
+        assert run.frames == 30 and run.stat.frozen
+        assert np.mean(run.stat.mean()) == pytest.approx(100 * (i + 1), rel=0.05)
+
+
+def test_collect_demo_cameras():
+    pymmcore_plus = pytest.importorskip("pymmcore_plus")
+    if pymmcore_plus.find_micromanager() is None:
+        pytest.skip("Micro-Manager is not installed")
+    sources = {
+        "cam1": CameraSource("DemoCamera", "DCam", {"Mode": "Noise"}),
+        "cam2": CameraSource("DemoCamera", "DCam", {"Mode": "Noise"}),
+    }
+    runs = collect_cameras(sources, 10)
+    assert all(run.frames == 10 for run in runs.values())
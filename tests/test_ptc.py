@@ -0,0 +1,386 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from conftest import SimCamera
+from pyptc._ptc import (
+    ClippedStat,
+    FrameTimings,
+    HistogramStat,
+    MomentStat,
+    PairDiffStat,
+    PTCResult,
+    QuantileStat,
+    RegionStat,
+    RunningStat,
+    acquire_ptc,
+    collect_stats,
+    collect_stats_parallel,
+)
+
+
+def test_running_stat_scalars():
+    stat = RunningStat()
+    data = [2.0, 4.0, 4.0, 5.0, 7.0]
+    for x in data:
+        stat.push(x)
+    assert len(stat) == 5
+    assert stat.mean() == pytest.approx(np.mean(data))
+    assert stat.var() == pytest.approx(np.var(data, ddof=1))
+    assert stat.std() == pytest.approx(np.std(data, ddof=1))
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_running_stat_push(stack, dtype):
+    stat = RunningStat(dtype=dtype)
+    for frame in stack:
+        stat.push(frame)
+    assert stat.mean().dtype == dtype
+    np.testing.assert_allclose(stat.mean(), stack.mean(0), rtol=1e-5)
+    np.testing.assert_allclose(stat.var(), stack.var(0, ddof=1), rtol=1e-4)
+
+
+def test_running_stat_push_many(stack):
+    stat = RunningStat()
+    stat.push(stack[0])
+    stat.push_many(stack[1:12])
+    stat.push_many(stack[12:])
+    assert len(stat) == len(stack)
+    np.testing.assert_allclose(stat.mean(), stack.mean(0))
+    np.testing.assert_allclose(stat.var(), stack.var(0, ddof=1))
+
+
+def test_collect_stats(stack):
+    frames = iter(stack)
+    seen = []
+    stat = collect_stats(
+        lambda: next(frames), n=len(stack), callback=lambda img, s: seen.append(img)
+    )
+    assert len(seen) == len(stack)
+    np.testing.assert_allclose(stat.var(), stack.var(0, ddof=1))
+    with pytest.raises(RuntimeError):
+        stat.push(stack[0])
+
+
+def test_running_stat_merge(stack):
+    a, b = RunningStat(), RunningStat()
+    a.push_many(stack[:7])
+    b.push_many(stack[7:])
+    a.merge(b)
+    np.testing.assert_allclose(a.mean(), stack.mean(0))
+    np.testing.assert_allclose(a.var(), stack.var(0, ddof=1))
+
+    stats = [RunningStat() for _ in range(3)]
+    for i, frame in enumerate(stack):
+        stats[i % 3].push(frame)
+    combined = RunningStat.combine(stats)
+    assert len(combined) == len(stack)
+    np.testing.assert_allclose(combined.var(), stack.var(0, ddof=1))
+
+
+def _poisson_frame():
+    return np.random.poisson(100, size=(16, 16))
+
+
+@pytest.mark.parametrize("executor", [None, ThreadPoolExecutor, ProcessPoolExecutor])
+def test_collect_stats_parallel(executor):
+    if executor is None:
+        stat = collect_stats_parallel(_poisson_frame, n=25, workers=4)
+    else:
+        with executor(2) as pool:
+            stat = collect_stats_parallel(_poisson_frame, n=25, executor=pool)
+    assert stat.frozen
+    assert len(stat) == 25
+    assert stat.mean().shape == (16, 16)
+    assert 50 < stat.var().mean() < 200
+
+
+@pytest.mark.parametrize("stat_type", [RunningStat, PairDiffStat])
+def test_acquire_ptc(stat_type):
+    exposures = np.concatenate([[0], np.geomspace(0.05, 30, 20)])
+    result = acquire_ptc(SimCamera(), exposures, n_frames=20, stat_type=stat_type)
+    assert result.signal.shape == result.variance.shape == exposures.shape
+    assert np.all(np.diff(result.signal) >= 0)
+
+    fit = result.fit()
+    assert fit.conversion_gain == pytest.approx(2, rel=0.1)
+    assert fit.read_noise == pytest.approx(4, rel=0.25)
+    assert fit.offset == pytest.approx(100, abs=1)
+    assert fit.full_well == pytest.approx(2 * (4095 - 100), rel=0.25)
+
+
+def test_ptc_fit_vectorized():
+    x = np.linspace(0, 1000, 12)
+    signal = np.stack([100 + x, 50 + x], axis=-1)
+    variance = np.stack([4 + x / 2, 9 + x / 4], axis=-1)
+    fit = PTCResult(np.arange(12.0), signal, variance, 10).fit()
+    np.testing.assert_allclose(fit.conversion_gain, [2, 4])
+    np.testing.assert_allclose(fit.read_noise, [4, 12])
+    np.testing.assert_allclose(fit.offset, [100, 50])
+    with pytest.raises(ValueError, match="dark"):
+        PTCResult(np.arange(1.0, 13), signal, variance, 10).fit()
+
+
+def test_pair_diff_stat():
+    rng = np.random.default_rng(2)
+    # strong fixed pattern plus poisson noise: the pair difference cancels the former
+    pattern = rng.uniform(0, 1000, (64, 64))
+    frames = [pattern + rng.poisson(200, (64, 64)) for _ in range(9)]
+    stat = collect_stats(iter(frames).__next__, n=len(frames), stat=PairDiffStat())
+    assert isinstance(stat, PairDiffStat)
+    assert stat.frozen
+    assert stat.pairs == 4
+    np.testing.assert_allclose(stat.mean(), np.mean(frames, axis=0))
+    expected = np.mean(
+        [(a - b) ** 2 / 2 for a, b in zip(frames[:8:2], frames[1:8:2])], 0
+    )
+    np.testing.assert_allclose(stat.var(), expected)
+    assert stat.var().mean() == pytest.approx(200, rel=0.05)
+
+
+def test_running_stat_checkpoint(stack, tmp_path):
+    frames = iter(stack)
+
+    def crashy_snap():
+        if len(stat) == 13:
+            raise KeyboardInterrupt
+        return next(frames)
+
+    stat = RunningStat(path=tmp_path)
+    with pytest.raises(KeyboardInterrupt):
+        collect_stats(crashy_snap, n=len(stack), stat=stat, checkpoint_every=5)
+    assert isinstance(stat._m, np.memmap)
+    assert (tmp_path / "mean.npy").exists()
+
+    # resume from the last checkpoint (10 frames), re-taking the 3 lost frames
+    resumed = RunningStat.load(tmp_path)
+    assert len(resumed) == 10
+    frames = iter(stack[10:])
+    collect_stats(lambda: next(frames), n=len(stack), stat=resumed)
+    assert len(resumed) == len(stack)
+    # a finished stat keeps only its (memory-mapped) moments
+    assert resumed.frozen and resumed._d is None
+    np.testing.assert_allclose(resumed.mean(), stack.mean(0))
+    np.testing.assert_allclose(resumed.var(), stack.var(0, ddof=1))
+
+
+def test_histogram_stat(stack):
+    stat = collect_stats(iter(stack).__next__, n=len(stack), stat=HistogramStat())
+    assert stat.counts.size == 2**16
+    assert stat.counts.sum() == stack.size
+    assert stat.mean() == pytest.approx(stack.mean())
+    assert stat.var() == pytest.approx(stack.var(ddof=1))
+
+    for result, expected in zip(stat.histogram(50), np.histogram(stack, 50)):
+        np.testing.assert_allclose(result, expected)
+    missing = stat.missing_codes()
+    values = np.unique(stack)
+    assert not np.isin(missing, values).any()
+    assert len(missing) + len(values) == values[-1] - values[0] + 1
+
+
+def test_histogram_stat_codes():
+    stat = HistogramStat(codes=4096)
+    stat.push(np.array([[0, 4095]]))
+    assert stat.counts.size == 4096
+    with pytest.raises(ValueError):
+        stat.push(np.array([4096]))
+    with pytest.raises(TypeError):
+        HistogramStat().push(np.zeros(3))
+
+
+def test_histogram_stat_clear_resizes():
+    stat = HistogramStat()
+    stat.push(np.array([[0, 255]], np.uint8))
+    assert stat.counts.size == 256
+    stat.clear()
+    stat.push(np.array([[0, 4095]], np.uint16))
+    assert stat.counts.size == 2**16
+    assert stat.counts.sum() == 2 and stat.counts[4095] == 1
+
+
+def test_region_stat_tiles(stack):
+    stat = collect_stats(iter(stack).__next__, n=20, stat=RegionStat(tile=(16, 16)))
+    assert stat.mean().shape == stat.var().shape == (2, 3)
+    tiles = stack.reshape(20, 2, 16, 3, 16).astype(float)
+    np.testing.assert_allclose(stat.mean(), tiles.mean(axis=(0, 2, 4)))
+    diff = (stack[::2].astype(float) - stack[1::2]) ** 2 / 2
+    np.testing.assert_allclose(
+        stat.var(), diff.reshape(10, 2, 16, 3, 16).mean(axis=(0, 2, 4))
+    )
+    np.testing.assert_allclose(
+        stat.spatial_var(), tiles.var(axis=(2, 4), ddof=1).mean(axis=0)
+    )
+
+
+def test_region_stat_labels(stack):
+    labels = np.zeros(stack.shape[1:], int)
+    labels[:, 24:] = 1
+    stat = collect_stats(iter(stack).__next__, n=20, stat=RegionStat(labels=labels))
+    np.testing.assert_allclose(
+        stat.mean(), [stack[..., :24].mean(), stack[..., 24:].mean()]
+    )
+    with pytest.raises(ValueError):
+        RegionStat()
+
+
+def test_region_stat_blocks(stack):
+    labels = np.arange(stack[0].size).reshape(stack.shape[1:]) % 5
+    for kwargs in ({"tile": (8, 16)}, {"labels": labels}):
+        whole, blocked = RegionStat(**kwargs), RegionStat(**kwargs)
+        blocked._block_pixels = 100  # a few rows, not a multiple of the tiles
+        for frame in stack:
+            whole.push(frame)
+            blocked.push(frame)
+        for name in ("mean", "var", "spatial_var"):
+            a, b = getattr(whole, name)(), getattr(blocked, name)()
+            np.testing.assert_allclose(a, b)
+    assert blocked._a is not None and blocked._a.dtype == stack.dtype
+    assert blocked._labels is not None and blocked._labels.dtype == np.uint8
+
+
+def test_region_stat_degenerate(stack):
+    labels = np.zeros(stack.shape[1:], int)
+    labels[0, 0] = 2  # region 1 is empty, region 2 has a single pixel
+    stat = collect_stats(iter(stack).__next__, n=20, stat=RegionStat(labels=labels))
+    assert np.isnan(stat.mean()[1]) and np.isnan(stat.var()[1])
+    assert np.isfinite(stat.mean()[[0, 2]]).all()
+    np.testing.assert_array_equal(np.isnan(stat.spatial_var()), [False, True, True])
+
+    stat = collect_stats(iter(stack).__next__, n=20, stat=RegionStat(tile=(1, 1)))
+    np.testing.assert_allclose(stat.mean(), stack.mean(axis=0))
+    assert np.isnan(stat.spatial_var()).all()
+
+    with pytest.raises(ValueError):
+        RegionStat(tile=(0, 4))
+    with pytest.raises(ValueError):
+        RegionStat(labels=-labels)
+    with pytest.raises(ValueError):
+        RegionStat(tile=(64, 64)).push(stack[0])
+
+
+def test_acquire_ptc_regions():
+    exposures = np.concatenate([[0], np.geomspace(0.05, 30, 20)])
+    result = acquire_ptc(
+        SimCamera(shape=(64, 64)),
+        exposures,
+        n_frames=10,
+        stat_type=lambda: RegionStat(tile=(32, 32)),
+    )
+    assert result.signal.shape == (21, 2, 2)
+    fit = result.fit()
+    np.testing.assert_allclose(fit.conversion_gain, 2, rtol=0.1)
+
+
+def test_collect_stats_timings(stack):
+    frames = iter(stack)
+    seen = []
+    stat = collect_stats(
+        lambda: next(frames),
+        len(stack),
+        callback=lambda img, stat: time.sleep(0.001),
+        timings=True,
+    )
+    timings = stat.timings
+    assert timings.durations.shape == (len(stack), len(FrameTimings.STAGES))
+    assert timings.intervals.shape == (len(stack) - 1,)
+    summary = timings.summary()
+    assert summary["callback"]["p50"] >= 0.001
+    assert summary["frames"] == len(stack) and summary["dropped"] == 0
+    assert summary["jitter"] >= 0
+
+    timings = FrameTimings()
+    timings.add_hook(lambda i, durations: seen.append((i, durations.shape)))
+    frames = iter(stack)
+    collect_stats(lambda: next(frames), 3, timings=timings)
+    assert seen == [(i, (len(FrameTimings.STAGES),)) for i in range(3)]
+    assert collect_stats(lambda: stack[0], 2).timings is None
+
+
+def test_clipped_stat():
+    rng = np.random.default_rng(3)
+    frames = rng.normal(100, 5, (200, 8, 8))
+    frames[50, 2, 3] = 5000  # cosmic ray
+    frames[120:123, 4, 4] = -1000  # glitch
+
+    clipped = ClippedStat(sigma=5)
+    running = RunningStat()
+    for frame in frames:
+        clipped.push(frame)
+        running.push(frame)
+
+    assert clipped.rejected[2, 3] >= 1 and clipped.rejected[4, 4] >= 3
+    assert clipped.rejected.sum() < 10
+    assert clipped.counts[0, 0] == 200 - clipped.rejected[0, 0]
+    assert running.var()[2, 3] > 1000
+    assert clipped.var()[2, 3] == pytest.approx(25, rel=0.3)
+    assert clipped.var()[4, 4] == pytest.approx(25, rel=0.3)
+    # without outliers, it matches RunningStat
+    clean = ~np.isin(np.arange(64), [2 * 8 + 3, 4 * 8 + 4]).reshape(8, 8)
+    no_reject = clean & (clipped.rejected == 0)
+    np.testing.assert_allclose(clipped.mean()[no_reject], running.mean()[no_reject])
+    np.testing.assert_allclose(clipped.var()[no_reject], running.var()[no_reject])
+
+
+def test_clipped_stat_low_signal():
+    # most pixels have little or no spread over the warmup
+    rng = np.random.default_rng(0)
+    frames = rng.poisson(0.3, (200, 64, 64)).astype(np.uint16)
+    stat = collect_stats(iter(frames).__next__, len(frames), stat=ClippedStat())
+    assert stat.rejected.sum() < 1e-3 * frames.size
+    assert np.mean(stat.mean()) == pytest.approx(frames.mean(), rel=0.01)
+    assert np.mean(stat.var()) == pytest.approx(0.3, rel=0.02)
+
+
+def test_quantile_stat():
+    rng = np.random.default_rng(4)
+    frames = rng.normal(100, 5, (300, 16, 16))
+    stat = collect_stats(iter(frames).__next__, len(frames), stat=QuantileStat())
+    for q in stat.quantiles:
+        expected = np.quantile(frames, q, axis=0)
+        assert np.abs(stat.quantile(q) - expected).mean() < 0.1 * 5
+    assert stat.quantile().shape == (3, 16, 16)
+    # the min/max markers are shared: 11 float32 + 9 int32 frames
+    assert stat._q.nbytes + stat._pos.nbytes == 80 * 16 * 16
+    assert stat.mean() is not None and stat.median().shape == (16, 16)
+    assert np.mean(stat.var()) == pytest.approx(25, rel=0.15)
+    with pytest.raises(ValueError):
+        stat.quantile(0.9)
+
+    # exact while fewer than 5 frames have been pushed
+    few = QuantileStat((0.5,))
+    for frame in frames[:3]:
+        few.push(frame)
+    np.testing.assert_allclose(few.median(), np.median(frames[:3], axis=0))
+    for frame in frames[3:]:
+        few.push(frame)
+    expected = np.median(frames, axis=0)
+    assert np.abs(few.median() - expected).mean() < 0.1 * 5
+
+
+def test_moment_stat():
+    rng = np.random.default_rng(5)
+    signal = rng.gamma(2.0, 10, (200, 12, 16))
+    frames = signal + 0.3 * np.roll(signal, -1, axis=2)  # crosstalk to the left
+    stat = collect_stats(iter(frames).__next__, len(frames), stat=MomentStat())
+
+    d = frames - frames.mean(0)
+    m2 = (d**2).mean(0)
+    np.testing.assert_allclose(stat.mean(), frames.mean(0))
+    np.testing.assert_allclose(stat.var(), frames.var(0, ddof=1))
+    np.testing.assert_allclose(stat.skew(), (d**3).mean(0) / m2**1.5)
+    np.testing.assert_allclose(stat.kurtosis(), (d**4).mean(0) / m2**2 - 3)
+    for name, (dy, dx) in MomentStat.NEIGHBORS.items():
+        a, b = d[:, : 12 - dy, : 16 - dx], d[:, dy:, dx:]
+        np.testing.assert_allclose(stat.covariance(name), (a * b).sum(0) / 199)
+        corr = (a * b).sum(0) / np.sqrt((a**2).sum(0) * (b**2).sum(0))
+        np.testing.assert_allclose(stat.correlation(name), corr)
+
+    summary = stat.summary()
+    assert summary["skew"] == pytest.approx(np.sqrt(2), rel=0.3)
+    assert summary["correlation_right"] == pytest.approx(0.3 / 1.09, abs=0.05)
+    assert abs(summary["correlation_down"]) < 0.05
+    with pytest.raises(ValueError):
+        stat.covariance("left")
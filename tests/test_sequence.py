@@ -0,0 +1,86 @@
+import time
+
+import numpy as np
+
+from pyptc._ptc import RunningStat
+from pyptc._sequence import FrameRing, collect_sequence_stats
+
+
+class FakeCore:
+    """Minimal stand-in for the CMMCorePlus sequence acquisition API."""
+
+    def __init__(self, frames, deliver=None):
+        self._frames = list(frames)
+        self._deliver = len(self._frames) if deliver is None else deliver
+        self._buffer = []
+        self._running = False
+        self.stopped = False
+
+    def startSequenceAcquisition(self, n, interval, stop_on_overflow):
+        self._buffer = self._frames[: min(n, self._deliver)]
+        self._running = True
+
+    def getRemainingImageCount(self):
+        return len(self._buffer)
+
+    def isSequenceRunning(self):
+        self._running = self._running and bool(self._buffer)
+        return self._running
+
+    def popNextImage(self):
+        return self._buffer.pop(0)
+
+    def stopSequenceAcquisition(self):
+        self._running = False
+        self.stopped = True
+
+
+def test_frame_ring():
+    ring = FrameRing(2)
+    assert ring.put(np.ones((2, 2)))
+    assert ring.put(np.zeros((2, 2)))
+    assert not ring.put(np.ones((2, 2)), timeout=0)
+    assert ring.depth() == 2
+    idx = ring.get()
+    assert ring.frames[idx].sum() == 4
+    ring.release(idx)
+    assert ring.put(np.ones((2, 2)), timeout=0)
+
+
+def test_collect_sequence_stats(stack):
+    core = FakeCore(stack)
+    stat = collect_sequence_stats(core, n=len(stack), buffer_size=4)
+    assert core.stopped
+    assert len(stat) == len(stack)
+    assert stat.dropped == 0
+    np.testing.assert_allclose(stat.mean(), stack.mean(0))
+    np.testing.assert_allclose(stat.var(), stack.var(0, ddof=1))
+
+
+def test_collect_sequence_stats_dropped(stack):
+    # the camera stops short of the requested number of frames
+    stat = collect_sequence_stats(FakeCore(stack, deliver=12), n=len(stack))
+    assert len(stat) == 12
+    assert stat.dropped == 8
+
+    # a slow consumer with a non-blocking producer drops frames at the ring
+    def slow(img, stat):
+        time.sleep(0.005)
+
+    stat = collect_sequence_stats(
+        FakeCore(stack), n=len(stack), callback=slow, buffer_size=1, block=False
+    )
+    assert stat.dropped > 0
+    assert len(stat) + stat.dropped == len(stack)
+
+
+def test_collect_sequence_stats_resume(stack):
+    stat = RunningStat()
+    stat.push_many(stack[:5])
+    stat.dropped = 1
+    core = FakeCore(stack[5:])
+    collect_sequence_stats(core, n=len(stack), stat=stat)
+    assert len(stat) == len(stack) and stat.frozen
+    assert stat.dropped == 1
+    np.testing.assert_allclose(stat.mean(), stack.mean(0))
+    np.testing.assert_allclose(stat.var(), stack.var(0, ddof=1))
@@ -0,0 +1,85 @@
+import time
+from functools import partial
+
+import numpy as np
+import pytest
+
+from conftest import PoissonSource
+from pyptc._ptc import RegionStat
+from pyptc._shm import AcquisitionWorker, SharedRing
+
+
+@pytest.fixture
+def ring():
+    ring = SharedRing.create((4, 4), np.uint16, slots=3)
+    yield ring
+    ring.close()
+
+
+def test_shared_ring(ring):
+    reader = SharedRing(ring.spec)
+    try:
+        assert reader.latest() is None
+        ring.publish(np.full((4, 4), 1), tag=10)
+        seq, tag, data = reader.latest()
+        assert (seq, tag) == (1, 10) and (data == 1).all()
+        assert reader.latest() is None  # nothing new
+
+        for i in range(2, 6):
+            ring.publish(np.full((4, 4), i), tag=i)
+        seq, tag, data = reader.latest(copy=False)
+        assert (seq, tag) == (5, 5) and (data == 5).all()
+        assert reader.missed == 3
+        assert reader.valid(5)
+        ring.publish(0)
+        ring.publish(0)
+        ring.publish(0)  # slot of seq 5 overwritten
+        assert not reader.valid(5)
+        del data
+    finally:
+        reader.close()
+
+
+def test_acquisition_worker():
+    with AcquisitionWorker(PoissonSource(), n=200, interval=0) as worker:
+        stat = worker.result(timeout=60)
+        assert len(stat) == 200 and stat.frozen
+        assert worker.frames.latest()[1] == 199  # tag is the frame index
+        seq, n, data = worker.stats.latest()
+        assert n == 200
+        np.testing.assert_allclose(data[0], stat.mean())
+        np.testing.assert_allclose(data[1], stat.var())
+
+
+def test_acquisition_worker_regions():
+    stat_type = partial(RegionStat, tile=(8, 8))
+    with AcquisitionWorker(
+        PoissonSource(), n=20, interval=0, stat_type=stat_type
+    ) as worker:
+        stat = worker.result(timeout=60)
+        assert worker.stats.spec.shape == (2, 2, 2)
+        seq, n, data = worker.stats.latest()
+        assert n == 20
+        np.testing.assert_allclose(data[0], stat.mean())
+        np.testing.assert_allclose(data[1], stat.var())
+
+
+def test_acquisition_worker_stop():
+    worker = AcquisitionWorker(PoissonSource())
+    worker.start()
+    worker.stop()
+    assert len(worker.result(timeout=60)) >= 1
+    worker.close()
+
+
+def test_acquisition_worker_close_without_result():
+    # the accumulator is far bigger than the pipe buffer: the worker can only exit
+    # once close() has read it
+    worker = AcquisitionWorker(PoissonSource(shape=(512, 512)))
+    worker.start()
+    t0 = time.monotonic()
+    worker.close()
+    assert time.monotonic() - t0 < 4
+    assert not worker.is_alive()
+    stat = worker.result(timeout=0)
+    assert stat.mean().shape == (512, 512) and stat.frozen
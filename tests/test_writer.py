@@ -0,0 +1,82 @@
+import io
+import time
+
+import numpy as np
+import pytest
+
+from pyptc._ptc import collect_stats
+from pyptc._writer import CODECS, FrameWriter, read_frames
+
+
+@pytest.mark.parametrize("compression", [None, "zlib", "lzma"])
+def test_frame_writer(stack, tmp_path, compression):
+    frames = iter(stack)
+    with FrameWriter(tmp_path, chunk_size=4, compression=compression) as sink:
+        stat = collect_stats(lambda: next(frames), n=len(stack), sink=sink)
+    assert len(stat) == len(stack)
+    assert len(list((tmp_path / "chunks").iterdir())) == 5
+
+    stats = sink.stats()
+    assert stats["frames"] == len(stack)
+    assert stats["dropped"] == 0
+    assert stats["depth"] == 0
+    np.testing.assert_array_equal(read_frames(tmp_path), stack)
+
+
+def test_frame_writer_bad_compression(tmp_path):
+    with pytest.raises(ValueError, match="compression"):
+        FrameWriter(tmp_path, compression="nope")
+
+
+@pytest.mark.parametrize("level", [1, 9])
+@pytest.mark.parametrize("compression", ["zlib", "bz2", "lzma"])
+def test_frame_writer_level(stack, tmp_path, compression, level):
+    with FrameWriter(tmp_path, 10, compression, level) as sink:
+        for frame in stack[:10]:
+            sink.put(frame)
+    np.testing.assert_array_equal(read_frames(tmp_path), stack[:10])
+
+    # the chunk was compressed at `level`
+    buf = io.BytesIO()
+    np.lib.format.write_array(buf, stack[:10])
+    kwarg = {"zlib": "level", "bz2": "compresslevel", "lzma": "preset"}[compression]
+    expected = CODECS[compression].compress(buf.getvalue(), **{kwarg: level})
+    assert (tmp_path / "chunks" / f"000000.npy.{compression}").read_bytes() == expected
+
+
+@pytest.mark.parametrize("compression", ["zlib", "bz2", "lzma"])
+def test_frame_writer_bad_level(tmp_path, compression):
+    with pytest.raises(ValueError, match="level"):
+        FrameWriter(tmp_path, compression=compression, level=42)
+
+
+def test_frame_writer_readable_before_close(stack, tmp_path):
+    sink = FrameWriter(tmp_path, chunk_size=4)
+    assert len(read_frames(tmp_path)) == 0  # the store is valid from the start
+    for frame in stack[:10]:
+        sink.put(frame)
+    deadline = time.perf_counter() + 10
+    while sink.frames_written < 8 and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    # e.g. after a crash: the full chunks written so far can be read back
+    np.testing.assert_array_equal(read_frames(tmp_path), stack[:8])
+    sink.close()
+    np.testing.assert_array_equal(read_frames(tmp_path), stack[:10])
+
+
+def test_collect_stats_sink_nonblocking(stack):
+    class FullSink:
+        dropped = 0
+
+        def put(self, frame, block=True, timeout=None):
+            assert not block
+            self.dropped += 1
+            return False
+
+    sink = FullSink()
+    frames = iter(stack)
+    stat = collect_stats(
+        lambda: next(frames), len(stack), sink=sink, timings=True, sink_block=False
+    )
+    assert len(stat) == len(stack)
+    assert stat.timings.dropped == sink.dropped == len(stack)